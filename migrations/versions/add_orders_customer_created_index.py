@@ -0,0 +1,27 @@
+"""add composite index on orders(customer_id, created_at desc)
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-03-22 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Backs the "orders for customer, newest first" query so the sort
+    # is served from the index
+    op.create_index(
+        'ix_orders_customer_created',
+        'orders',
+        ['customer_id', sa.text('created_at DESC')]
+    )
+
+def downgrade():
+    op.drop_index('ix_orders_customer_created', table_name='orders')
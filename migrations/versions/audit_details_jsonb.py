@@ -0,0 +1,57 @@
+"""switch security_audit_logs.details to jsonb and add query indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-03-23 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Earlier revisions never created this table (it only existed via
+    # Base.metadata.create_all), so a fresh upgrade has nothing to
+    # alter; create it here before converting the column
+    if not sa.inspect(op.get_bind()).has_table('security_audit_logs'):
+        op.create_table(
+            'security_audit_logs',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('timestamp', sa.DateTime, nullable=False),
+            sa.Column('event_type', sa.String, nullable=False),
+            sa.Column('user_id', sa.String, nullable=True),
+            sa.Column('ip_address', sa.String, nullable=True),
+            sa.Column('user_agent', sa.String, nullable=True),
+            sa.Column('details', sa.JSON, nullable=True),
+            sa.Column('success', sa.Boolean, nullable=False)
+        )
+        op.create_index('ix_security_audit_logs_id', 'security_audit_logs', ['id'])
+
+    # JSONB stores the payload decomposed instead of as text, so reads
+    # skip re-parsing and containment lookups can be indexed
+    op.execute(
+        "ALTER TABLE security_audit_logs "
+        "ALTER COLUMN details TYPE jsonb USING details::jsonb"
+    )
+    op.execute(
+        "CREATE INDEX ix_audit_details_gin ON security_audit_logs "
+        "USING gin (details jsonb_path_ops)"
+    )
+    # Dashboard queries filter recent events by type
+    op.execute(
+        "CREATE INDEX ix_audit_ts ON security_audit_logs "
+        "(timestamp DESC, event_type)"
+    )
+
+def downgrade():
+    op.execute("DROP INDEX ix_audit_ts")
+    op.execute("DROP INDEX ix_audit_details_gin")
+    op.execute(
+        "ALTER TABLE security_audit_logs "
+        "ALTER COLUMN details TYPE json USING details::json"
+    )
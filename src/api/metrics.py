@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from fastapi.responses import Response
 
 from src.utils.monitoring import metrics_tracker
 from src.utils.logging import get_logger
@@ -14,11 +14,13 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-@router.get("/", response_model=Dict[str, Any])
+@router.get("/")
 async def get_application_metrics():
     """Get all application metrics"""
     logger.info("Metrics requested")
-    return metrics_tracker.get_metrics()
+    # Serve the cached serialized snapshot directly, skipping FastAPI's
+    # per-request jsonable_encoder/json.dumps pass
+    return Response(content=metrics_tracker.get_metrics_json(), media_type="application/json")
 
 @router.post("/reset")
 async def reset_application_metrics():
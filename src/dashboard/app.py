@@ -26,7 +26,7 @@ async def dashboard(request: Request):
 @app.get("/api/metrics")
 async def get_metrics():
     """Get current metrics"""
-    return metrics_tracker.get_metrics()
+    return metrics_tracker.get_metrics().to_dict()
 
 @app.get("/api/health")
 async def get_health():
@@ -126,6 +126,8 @@ async def startup_event():
 async def shutdown_event():
     """Clean up resources on shutdown"""
     logger.info("Shutting down WhatsApp AI Ordering Bot")
+    from src.utils.twilio_client import twilio_client
+    await twilio_client.aclose()
 
 @app.get("/")
 async def root():
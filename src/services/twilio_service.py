@@ -1,6 +1,9 @@
 from typing import List, Optional, Dict, Any
+import asyncio
+from requests.adapters import HTTPAdapter
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
 from twilio.jwt.access_token import AccessToken
 from twilio.jwt.access_token.grants import VoiceGrant, ChatGrant
 from twilio.twiml.voice_response import VoiceResponse, Gather
@@ -16,9 +19,16 @@ class TwilioService:
     
     def __init__(self):
         """Initialize Twilio client."""
+        # Mount a pooled adapter so the SDK reuses connections instead
+        # of re-handshaking TLS per request
+        http_client = TwilioHttpClient()
+        http_client.session.mount(
+            "https://", HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        )
         self.client = Client(
             settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN
+            settings.TWILIO_AUTH_TOKEN,
+            http_client=http_client
         )
         self.phone_number = settings.TWILIO_PHONE_NUMBER
         self.messaging_service_sid = settings.TWILIO_MESSAGING_SERVICE_SID
@@ -48,7 +58,10 @@ class TwilioService:
             Message details
         """
         try:
-            message = self.client.messages.create(
+            # The SDK call blocks for the full HTTPS round-trip; run it
+            # on a thread so the event loop keeps serving other requests
+            message = await asyncio.to_thread(
+                self.client.messages.create,
                 messaging_service_sid=self.messaging_service_sid,
                 to=to,
                 body=body,
@@ -90,7 +103,8 @@ class TwilioService:
             Call details
         """
         try:
-            call = self.client.calls.create(
+            call = await asyncio.to_thread(
+                self.client.calls.create,
                 to=to,
                 from_=self.phone_number,
                 url=twiml_url,
@@ -128,9 +142,10 @@ class TwilioService:
             Verification details
         """
         try:
-            verification = self.client.verify.v2.services(
-                self.verify_service_sid
-            ).verifications.create(
+            verification = await asyncio.to_thread(
+                self.client.verify.v2.services(
+                    self.verify_service_sid
+                ).verifications.create,
                 to=phone_number,
                 channel='sms'
             )
@@ -164,9 +179,10 @@ class TwilioService:
             Verification check details
         """
         try:
-            check = self.client.verify.v2.services(
-                self.verify_service_sid
-            ).verification_checks.create(
+            check = await asyncio.to_thread(
+                self.client.verify.v2.services(
+                    self.verify_service_sid
+                ).verification_checks.create,
                 to=phone_number,
                 code=code
             )
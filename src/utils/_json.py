@@ -0,0 +1,27 @@
+"""Shared JSON helpers: orjson when installed, stdlib otherwise.
+
+Several hot paths (metrics snapshots, Slack payloads, AI responses,
+webhook bodies) serialize or parse JSON on every request; orjson does
+both several times faster than stdlib json. This module keeps the
+try-import fallback in one place instead of a copy per caller.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes.
+
+        OPT_NON_STR_KEYS matches stdlib behavior for dicts keyed by
+        ints (e.g. metrics status_codes counters).
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    loads = json.loads
@@ -1,7 +1,8 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Index, JSON, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -11,12 +12,41 @@ load_dotenv()
 # Get database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./whatsapp_bot.db")
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Create SQLAlchemy engine with a persistent connection pool: short
+# queries are dominated by connect overhead, so connections are reused,
+# health-checked on checkout and recycled before server-side timeouts
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    future=True,
+)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_url(url: str) -> str:
+    """Rewrite a sync database URL to its async driver equivalent"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+# Async engine and session factory: async handlers await their queries
+# instead of blocking the event loop on driver I/O
+async_engine = create_async_engine(
+    _async_url(DATABASE_URL),
+    pool_size=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -48,7 +78,13 @@ class Order(Base):
     shipping_address = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
+    # Composite index so "orders for customer, newest first" is an
+    # index-backed scan instead of a sort
+    __table_args__ = (
+        Index("ix_orders_customer_created", "customer_id", created_at.desc()),
+    )
+
     # Relationships
     customer = relationship("Customer", back_populates="orders")
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import logging.handlers
 import os
@@ -6,13 +7,56 @@ from datetime import datetime
 from typing import Any, Dict, Optional, Callable
 import uuid
 import time
+from contextvars import ContextVar
 from functools import wraps
 
-# Configure the root logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Fields bound during a request, flushed as a single structured record
+_bound: ContextVar[Optional[Dict[str, Any]]] = ContextVar("bound", default=None)
+
+class JSONFormatter(logging.Formatter):
+    """Format log records as JSON for structured logging."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_data = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_data)
+
+
+class FastFileHandler(logging.Handler):
+    """
+    Append-only file handler that emits each record with a single os.write.
+
+    POSIX guarantees O_APPEND writes are atomic across processes, so no
+    Python-side locking or rollover is needed; rotation is delegated to
+    an external logrotate.
+    """
+
+    def __init__(self, path: str, level=logging.NOTSET):
+        super().__init__(level)
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def createLock(self):
+        # O_APPEND writes are atomic; no handler lock needed
+        self.lock = None
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            os.write(self.fd, (self.format(record) + "\n").encode())
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        finally:
+            super().close()
+
 
 class StructuredLogger:
     """
@@ -90,6 +134,22 @@ class StructuredLogger:
         """Log an exception with traceback."""
         self._log(logging.ERROR, message, exc_info=exc_info, **kwargs)
 
+    def bind(self, **kwargs):
+        """Accumulate fields for the current request, emitted by flush_request."""
+        bound = _bound.get()
+        if bound is None:
+            bound = {}
+            _bound.set(bound)
+        bound.update(kwargs)
+
+    def flush_request(self, status: str = "completed", **extra):
+        """Emit one wide log record with all fields bound during the request."""
+        bound = _bound.get()
+        if bound is None and not extra:
+            return
+        self._log(logging.INFO, "request", status=status, **(bound or {}), **extra)
+        _bound.set(None)
+
 
 # Create a context manager for request context
 class RequestContext:
@@ -118,63 +178,67 @@ class RequestContext:
         return self.logger
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Flush any bound fields as a single request record
+        self.logger.flush_request("failed" if exc_type else "completed")
+
         # Restore previous values
         self.logger.request_id = self._previous_request_id
         self.logger.user_id = self._previous_user_id
 
 
+def _log_outcome(logger: "StructuredLogger", fname: str, start: float, exc: Optional[Exception]):
+    """Log the success or failure of a timed function call."""
+    execution_time_ms = round((time.perf_counter() - start) * 1000, 2)
+    if exc is None:
+        logger.info(
+            f"Function {fname} executed successfully",
+            function=fname,
+            execution_time_ms=execution_time_ms
+        )
+    else:
+        logger.exception(
+            f"Function {fname} failed",
+            function=fname,
+            execution_time_ms=execution_time_ms,
+            error=str(exc)
+        )
+
+
 # Decorator for timing function execution
 def log_execution_time(logger: StructuredLogger):
     """
     Decorator to log the execution time of a function.
     """
     def decorator(func: Callable):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = await func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger.info(
-                    f"Function {func.__name__} executed successfully",
-                    function=func.__name__,
-                    execution_time_ms=round(execution_time * 1000, 2)
-                )
+        # Resolve coroutine-ness once, at decoration time
+        is_coro = asyncio.iscoroutinefunction(func)
+        fname = func.__name__
+
+        if is_coro:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    _log_outcome(logger, fname, start, e)
+                    raise
+                _log_outcome(logger, fname, start, None)
                 return result
-            except Exception as e:
-                execution_time = time.time() - start_time
-                logger.exception(
-                    f"Function {func.__name__} failed",
-                    function=func.__name__,
-                    execution_time_ms=round(execution_time * 1000, 2),
-                    error=str(e)
-                )
-                raise
-        
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger.info(
-                    f"Function {func.__name__} executed successfully",
-                    function=func.__name__,
-                    execution_time_ms=round(execution_time * 1000, 2)
-                )
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    _log_outcome(logger, fname, start, e)
+                    raise
+                _log_outcome(logger, fname, start, None)
                 return result
-            except Exception as e:
-                execution_time = time.time() - start_time
-                logger.exception(
-                    f"Function {func.__name__} failed",
-                    function=func.__name__,
-                    execution_time_ms=round(execution_time * 1000, 2),
-                    error=str(e)
-                )
-                raise
-        
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
-    
+
+        return wrapper
+
     return decorator
 
 
@@ -182,19 +246,19 @@ def log_execution_time(logger: StructuredLogger):
 logger = StructuredLogger("mkzt")
 
 def setup_logger(name: str = "whatsapp_bot") -> logging.Logger:
-    """Setup logging configuration"""
+    """Setup logging configuration (idempotent)"""
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    
+
+    # Avoid re-adding handlers when imported from multiple entry points
+    if logger.handlers:
+        return logger
+
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
     
-    # File handler with rotation
-    file_handler = logging.handlers.RotatingFileHandler(
-        "logs/whatsapp_bot.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
+    # Append-only file handler; rotation is handled by logrotate
+    file_handler = FastFileHandler("logs/whatsapp_bot.log")
     file_handler.setFormatter(JSONFormatter())
     
     # Console handler
@@ -207,9 +271,6 @@ def setup_logger(name: str = "whatsapp_bot") -> logging.Logger:
     
     return logger
 
-# Create default logger
-logger = setup_logger()
-
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name"""
     return logging.getLogger(name)
@@ -1,34 +1,44 @@
 import os
 import logging
-import logging.handlers
 from datetime import datetime
 from pathlib import Path
 
+from src.utils.logger import FastFileHandler
+
 # Create logs directory if it doesn't exist
 logs_dir = Path("logs")
 logs_dir.mkdir(exist_ok=True)
 
+# Memoization state so repeated calls (worker reloads, tests) don't
+# re-create handlers and leak file descriptors
+_SETUP_DONE = None
+_LOGGERS = None
+
 # Configure logging
 def setup_logging():
-    """Set up logging configuration for the application"""
+    """Set up logging configuration for the application (idempotent per day/process)"""
+    global _SETUP_DONE, _LOGGERS
+    key = (datetime.now().date(), os.getpid())
+    if _SETUP_DONE == key:
+        return _LOGGERS
+
     # Create a formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
-    # Create a file handler for all logs
-    log_file = logs_dir / f"app_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file, maxBytes=10485760, backupCount=10
-    )
+
+    # Compute the date stamp once for both file names
+    date_stamp = datetime.now().strftime('%Y%m%d')
+
+    # Create a file handler for all logs (rotation handled by logrotate)
+    log_file = logs_dir / f"app_{date_stamp}.log"
+    file_handler = FastFileHandler(str(log_file))
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.INFO)
-    
+
     # Create a file handler for error logs
-    error_log_file = logs_dir / f"error_{datetime.now().strftime('%Y%m%d')}.log"
-    error_file_handler = logging.handlers.RotatingFileHandler(
-        error_log_file, maxBytes=10485760, backupCount=10
-    )
+    error_log_file = logs_dir / f"error_{date_stamp}.log"
+    error_file_handler = FastFileHandler(str(error_log_file))
     error_file_handler.setFormatter(formatter)
     error_file_handler.setLevel(logging.ERROR)
     
@@ -62,7 +72,9 @@ def setup_logging():
     # Configure each logger
     for logger in loggers.values():
         logger.setLevel(logging.INFO)
-    
+
+    _SETUP_DONE = key
+    _LOGGERS = loggers
     return loggers
 
 # Create a function to get a logger
@@ -1,17 +1,42 @@
 from typing import Dict, Any, List, Optional
-import json
 import re
+from collections import OrderedDict
 from src.utils.order_handler import OrderHandler
 from src.utils.customer_handler import CustomerHandler
 from src.ai.handler import AIHandler
 from src.utils.database import SessionLocal, Customer, Message
+from src.utils.logger import logger
+
+# Compiled once at import; matching greetings locally avoids an AI
+# round-trip for the most common message type
+_GREETING_RE = re.compile(r'^\s*(hi|hello|hey)\b', re.IGNORECASE)
 
 class MessageHandler:
+    # Bot traffic is dominated by a small repeated vocabulary ("help",
+    # "status?", emojis), so recent intents are cached to skip the AI call
+    INTENT_CACHE_SIZE = 4096
+
     def __init__(self):
         self.order_handler = OrderHandler()
         self.customer_handler = CustomerHandler()
         self.ai_handler = AIHandler()
-    
+        self._intent_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    async def _analyze_intent_cached(self, message_text: str) -> Dict[str, Any]:
+        """Analyze message intent, serving repeated texts from an LRU cache"""
+        key = message_text.strip().lower()[:128]
+        cached = self._intent_cache.get(key)
+        if cached is not None:
+            self._intent_cache.move_to_end(key)
+            return cached
+
+        intent_result = await self.ai_handler.analyze_intent(message_text)
+        if intent_result.get("status") == "success":
+            self._intent_cache[key] = intent_result
+            if len(self._intent_cache) > self.INTENT_CACHE_SIZE:
+                self._intent_cache.popitem(last=False)
+        return intent_result
+
     async def process_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process an incoming WhatsApp message"""
         try:
@@ -41,14 +66,18 @@ class MessageHandler:
                 )
                 db.add(message)
                 db.commit()
-            except Exception as e:
+            except Exception:
                 db.rollback()
-                print(f"Error saving message: {str(e)}")
+                logger.exception("Error saving message", customer_id=customer_id, message_id=message_id)
             finally:
                 db.close()
             
-            # Use AI to understand message intent
-            intent_result = await self.ai_handler.analyze_intent(message_text)
+            # Fast path: obvious greetings don't need an AI round-trip
+            if _GREETING_RE.match(message_text):
+                return await self._handle_greeting_intent(customer_id)
+
+            # Use AI to understand message intent (cached for repeated texts)
+            intent_result = await self._analyze_intent_cached(message_text)
             
             if intent_result["status"] != "success":
                 return {
@@ -58,7 +87,8 @@ class MessageHandler:
                 }
             
             intent = intent_result["intent"]
-            
+            logger.bind(intent=intent, customer_id=customer_id)
+
             # Process based on intent
             if intent == "order":
                 return await self._handle_order_intent(customer_id, message_text)
@@ -75,7 +105,7 @@ class MessageHandler:
                 }
                 
         except Exception as e:
-            print(f"Error processing message: {str(e)}")
+            logger.exception("Error processing message")
             return {
                 "status": "error",
                 "message": str(e),
@@ -182,8 +212,8 @@ class MessageHandler:
             )
             db.add(message)
             db.commit()
-        except Exception as e:
+        except Exception:
             db.rollback()
-            print(f"Error saving response: {str(e)}")
+            logger.exception("Error saving response", customer_id=customer_id, message_id=message_id)
         finally:
             db.close() 
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 from collections import deque
@@ -9,6 +10,43 @@ import os
 
 logger = get_logger(__name__)
 
+
+@dataclass(slots=True, frozen=True)
+class Metrics:
+    """Snapshot of current metrics with cheap attribute access"""
+    total_requests: int
+    error_count: int
+    error_rate: float
+    avg_response_time: float
+    uptime_seconds: float
+    consecutive_errors: int
+    last_error_time: Optional[str]
+    request_types: Dict[str, int]
+    avg_memory_usage_mb: float
+    avg_cpu_usage_percent: float
+    current_memory_usage_mb: float
+    current_cpu_usage_percent: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the JSON-able dict for API serialization"""
+        return {
+            "total_requests": self.total_requests,
+            "error_count": self.error_count,
+            "error_rate": self.error_rate,
+            "avg_response_time": self.avg_response_time,
+            "uptime_seconds": self.uptime_seconds,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error_time": self.last_error_time,
+            "request_types": self.request_types,
+            "system_metrics": {
+                "avg_memory_usage_mb": self.avg_memory_usage_mb,
+                "avg_cpu_usage_percent": self.avg_cpu_usage_percent,
+                "current_memory_usage_mb": self.current_memory_usage_mb,
+                "current_cpu_usage_percent": self.current_cpu_usage_percent
+            }
+        }
+
+
 class MetricsTracker:
     def __init__(self, max_history: int = 1000):
         """Initialize metrics tracker with a maximum history size"""
@@ -16,9 +54,10 @@ class MetricsTracker:
         self.request_times: deque = deque(maxlen=max_history)
         self.error_count = 0
         self.total_requests = 0
-        self.start_time = datetime.utcnow()
+        self._start_mono = time.monotonic()
         self.consecutive_errors = 0
-        self.last_error_time = None
+        # Raw epoch float; formatted to ISO only when a snapshot is built
+        self.last_error_ts: Optional[float] = None
         self.request_types = {
             "order": 0,
             "status": 0,
@@ -27,11 +66,23 @@ class MetricsTracker:
         }
         self.memory_usage = deque(maxlen=max_history)
         self.cpu_usage = deque(maxlen=max_history)
+        # Incremental window over the last 10 requests so trend analysis
+        # in check_health doesn't copy the full history deque
+        self._recent = deque(maxlen=10)
+        self._recent_sum = 0.0
+        # Cache the per-type threshold keys so check_health doesn't rebuild
+        # the f-strings on every poll
+        self._pct_threshold_keys = {k: f"{k}_percentage" for k in self.request_types}
 
     def track_request(self, duration: float, request_type: str = "other") -> None:
         """Track a request's duration and type"""
         self.request_times.append(duration)
+        dropped = self._recent[0] if len(self._recent) == 10 else 0.0
+        self._recent.append(duration)
+        self._recent_sum += duration - dropped
         self.total_requests += 1
+        if request_type not in self.request_types:
+            self._pct_threshold_keys[request_type] = f"{request_type}_percentage"
         self.request_types[request_type] = self.request_types.get(request_type, 0) + 1
         self._track_system_metrics()
 
@@ -48,14 +99,14 @@ class MetricsTracker:
         """Track an error occurrence"""
         self.error_count += 1
         self.consecutive_errors += 1
-        self.last_error_time = datetime.utcnow()
+        self.last_error_ts = time.time()
 
     def track_success(self) -> None:
         """Track a successful request"""
         self.consecutive_errors = 0
 
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get current metrics"""
+    def get_metrics(self) -> Metrics:
+        """Get a snapshot of current metrics"""
         if not self.request_times:
             avg_response_time = 0
             avg_memory_usage = 0
@@ -66,24 +117,22 @@ class MetricsTracker:
             avg_cpu_usage = sum(self.cpu_usage) / len(self.cpu_usage)
 
         error_rate = self.error_count / max(self.total_requests, 1)
-        uptime = (datetime.utcnow() - self.start_time).total_seconds()
-
-        return {
-            "total_requests": self.total_requests,
-            "error_count": self.error_count,
-            "error_rate": error_rate,
-            "avg_response_time": avg_response_time,
-            "uptime_seconds": uptime,
-            "consecutive_errors": self.consecutive_errors,
-            "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None,
-            "request_types": self.request_types,
-            "system_metrics": {
-                "avg_memory_usage_mb": avg_memory_usage,
-                "avg_cpu_usage_percent": avg_cpu_usage,
-                "current_memory_usage_mb": self.memory_usage[-1] if self.memory_usage else 0,
-                "current_cpu_usage_percent": self.cpu_usage[-1] if self.cpu_usage else 0
-            }
-        }
+        uptime = time.monotonic() - self._start_mono
+
+        return Metrics(
+            total_requests=self.total_requests,
+            error_count=self.error_count,
+            error_rate=error_rate,
+            avg_response_time=avg_response_time,
+            uptime_seconds=uptime,
+            consecutive_errors=self.consecutive_errors,
+            last_error_time=datetime.utcfromtimestamp(self.last_error_ts).isoformat() if self.last_error_ts else None,
+            request_types=self.request_types,
+            avg_memory_usage_mb=avg_memory_usage,
+            avg_cpu_usage_percent=avg_cpu_usage,
+            current_memory_usage_mb=self.memory_usage[-1] if self.memory_usage else 0,
+            current_cpu_usage_percent=self.cpu_usage[-1] if self.cpu_usage else 0
+        )
 
     def check_health(self, thresholds: Dict[str, float]) -> Dict[str, Any]:
         """Check health based on thresholds"""
@@ -99,10 +148,10 @@ class MetricsTracker:
         }
 
         # Check error rate
-        if metrics["error_rate"] > thresholds.get("error_rate", 0.1):
+        if metrics.error_rate > thresholds.get("error_rate", 0.1):
             health_status["checks"]["error_rate"] = {
                 "status": "unhealthy",
-                "value": metrics["error_rate"],
+                "value": metrics.error_rate,
                 "threshold": thresholds.get("error_rate", 0.1),
                 "severity": "high",
                 "description": "Error rate exceeds threshold"
@@ -110,10 +159,10 @@ class MetricsTracker:
             health_status["status"] = "unhealthy"
 
         # Check response time
-        if metrics["avg_response_time"] > thresholds.get("response_time", 2.0):
+        if metrics.avg_response_time > thresholds.get("response_time", 2.0):
             health_status["checks"]["response_time"] = {
                 "status": "unhealthy",
-                "value": metrics["avg_response_time"],
+                "value": metrics.avg_response_time,
                 "threshold": thresholds.get("response_time", 2.0),
                 "severity": "medium",
                 "description": "Average response time exceeds threshold"
@@ -121,10 +170,10 @@ class MetricsTracker:
             health_status["status"] = "unhealthy"
 
         # Check consecutive errors
-        if metrics["consecutive_errors"] > thresholds.get("consecutive_errors", 3):
+        if metrics.consecutive_errors > thresholds.get("consecutive_errors", 3):
             health_status["checks"]["consecutive_errors"] = {
                 "status": "unhealthy",
-                "value": metrics["consecutive_errors"],
+                "value": metrics.consecutive_errors,
                 "threshold": thresholds.get("consecutive_errors", 3),
                 "severity": "high",
                 "description": "Too many consecutive errors"
@@ -132,10 +181,10 @@ class MetricsTracker:
             health_status["status"] = "unhealthy"
 
         # Check memory usage
-        if metrics["system_metrics"]["current_memory_usage_mb"] > thresholds.get("memory_usage_mb", 1000):
+        if metrics.current_memory_usage_mb > thresholds.get("memory_usage_mb", 1000):
             health_status["checks"]["memory_usage"] = {
                 "status": "unhealthy",
-                "value": metrics["system_metrics"]["current_memory_usage_mb"],
+                "value": metrics.current_memory_usage_mb,
                 "threshold": thresholds.get("memory_usage_mb", 1000),
                 "severity": "high",
                 "description": "Memory usage exceeds threshold"
@@ -143,39 +192,39 @@ class MetricsTracker:
             health_status["status"] = "unhealthy"
 
         # Check CPU usage
-        if metrics["system_metrics"]["current_cpu_usage_percent"] > thresholds.get("cpu_usage_percent", 80):
+        if metrics.current_cpu_usage_percent > thresholds.get("cpu_usage_percent", 80):
             health_status["checks"]["cpu_usage"] = {
                 "status": "unhealthy",
-                "value": metrics["system_metrics"]["current_cpu_usage_percent"],
+                "value": metrics.current_cpu_usage_percent,
                 "threshold": thresholds.get("cpu_usage_percent", 80),
                 "severity": "medium",
                 "description": "CPU usage exceeds threshold"
             }
             health_status["status"] = "unhealthy"
 
-        # Check request distribution
-        total_requests = sum(metrics["request_types"].values())
+        # Check request distribution (total is already tracked, no sum() needed)
+        total_requests = self.total_requests
         if total_requests > 0:
-            for req_type, count in metrics["request_types"].items():
+            for req_type, count in metrics.request_types.items():
                 percentage = count / total_requests
-                if percentage > thresholds.get(f"{req_type}_percentage", 0.8):
+                threshold = thresholds.get(self._pct_threshold_keys[req_type], 0.8)
+                if percentage > threshold:
                     health_status["checks"][f"{req_type}_distribution"] = {
                         "status": "warning",
                         "value": percentage,
-                        "threshold": thresholds.get(f"{req_type}_percentage", 0.8),
+                        "threshold": threshold,
                         "severity": "low",
                         "description": f"High percentage of {req_type} requests"
                     }
 
         # Add trend analysis
-        if len(self.request_times) > 1:
-            recent_times = list(self.request_times)[-10:]
-            avg_recent = sum(recent_times) / len(recent_times)
-            if avg_recent > metrics["avg_response_time"] * 1.5:
+        if len(self._recent) > 1:
+            avg_recent = self._recent_sum / len(self._recent)
+            if avg_recent > metrics.avg_response_time * 1.5:
                 health_status["checks"]["response_time_trend"] = {
                     "status": "warning",
                     "value": avg_recent,
-                    "baseline": metrics["avg_response_time"],
+                    "baseline": metrics.avg_response_time,
                     "severity": "medium",
                     "description": "Recent response times are significantly higher than average"
                 }
@@ -2,270 +2,456 @@ import time
 import asyncio
 import functools
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from array import array
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from typing import Dict, Any, Callable, Optional
 from functools import wraps
+from src.utils._json import dumps as _dumps
 
 # Get logger
 logger = logging.getLogger("monitoring")
 
-class MetricsTracker:
+# Emit log records through a bounded queue so the track_* hot paths only
+# enqueue; formatting and I/O happen on the listener thread
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=65536)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _setup_async_logging():
+    global _log_listener
+    if _log_listener is not None:
+        return
+    real_handlers = logger.handlers[:] or [logging.StreamHandler()]
+    for handler in real_handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.propagate = False
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, *real_handlers, respect_handler_level=True
+    )
+    _log_listener.start()
+
+def shutdown_logging():
+    """Stop the background log listener, draining any queued records."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+_setup_async_logging()
+
+
+class _ReqStat:
+    """Per-endpoint request counters; __slots__ keeps entries compact and
+    attribute updates cheap on the hot path.
+
+    inc() is the whole numeric update kernel behind one call boundary,
+    so a compiled extension class with the same interface can be swapped
+    in for ultra-hot deployments without touching the call sites.
+    """
+    __slots__ = ("count", "total_time", "status_codes")
+
     def __init__(self):
-        self.metrics = {
-            "requests": {},
-            "errors": {},
-            "processing_times": {},
-            "custom": {}
-        }
-    
+        self.count = 0
+        self.total_time = 0.0
+        self.status_codes = Counter()
+
+    def inc(self, processing_time: float, status_code: int) -> None:
+        self.count += 1
+        self.total_time += processing_time
+        self.status_codes[status_code] += 1
+
+# Caps so long-running processes don't accumulate unbounded error
+# contexts / metric samples; deque(maxlen) drops the oldest in C
+MAX_ERROR_CONTEXTS = 1024
+MAX_CUSTOM_VALUES = 1024
+
+class _ErrStat:
+    """Per-error-type record; same compact-slots pattern as _ReqStat."""
+    __slots__ = ("count", "last_occurrence", "contexts")
+
+    def __init__(self):
+        self.count = 0
+        self.last_occurrence = None
+        self.contexts = deque(maxlen=MAX_ERROR_CONTEXTS)
+
+class _PTStat:
+    """Per-operation processing-time record; avg_time is derived on read."""
+    __slots__ = ("count", "total_time", "min_time", "max_time")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.min_time = float('inf')
+        self.max_time = 0.0
+
+def _new_custom_entry() -> Dict[str, Any]:
+    return {
+        "numeric": array("d"),  # interleaved (timestamp, value) pairs
+        "values": deque(maxlen=MAX_CUSTOM_VALUES),
+        "tags": {}
+    }
+
+# Metrics storage, shared by every MetricsTracker instance so middleware,
+# the track_time decorator and ad-hoc trackers all report into one place.
+# defaultdict factories collapse every "initialize if missing" branch
+# into a single hash probe on the hot paths.
+metrics = {
+    "requests": defaultdict(_ReqStat),
+    "errors": defaultdict(_ErrStat),
+    "processing_times": defaultdict(_PTStat),
+    "custom": defaultdict(_new_custom_entry)
+}
+
+# Snapshot cache: track_* calls only flip the dirty flag; the plain-dict
+# snapshot (and its serialized bytes) is rebuilt at most once per scrape,
+# not once per write
+_snapshot: Optional[Dict[str, Any]] = None
+_snapshot_json: Optional[bytes] = None
+_snapshot_dirty = True
+_snapshot_lock = threading.Lock()
+
+def _mark_dirty():
+    global _snapshot_dirty
+    _snapshot_dirty = True
+
+def _iso(ts: float, _fromts=datetime.fromtimestamp) -> str:
+    """Format a raw epoch float for snapshot output.
+
+    The constructor is prebound as a default so the list comprehensions
+    in the snapshot builder pay one LOAD_FAST per timestamp instead of
+    repeated attribute lookups."""
+    return _fromts(ts).isoformat()
+
+@functools.lru_cache(maxsize=4096)
+def _reqkey(method: str, endpoint: str) -> str:
+    """Memoized, interned "METHOD:endpoint" key.
+
+    Endpoints are a small finite set, so this turns the per-request
+    f-string allocation into a cache hit on an already-hashed string;
+    interning lets dict lookups short-circuit to pointer comparison.
+    """
+    return sys.intern(f"{method}:{endpoint}")
+
+
+class MetricsTracker:
+    """Single implementation of metric collection.
+
+    All instances read and write the shared module-level store, so the
+    middleware singleton, the track_time decorator and trackers created
+    in tests observe the same metrics.
+    """
+
     def track_request(self, endpoint: str, method: str, status_code: int, processing_time: float):
         """Track API request metrics"""
-        key = f"{method}:{endpoint}"
-        
-        # Initialize if not exists
-        if key not in self.metrics["requests"]:
-            self.metrics["requests"][key] = {
-                "count": 0,
-                "status_codes": {},
-                "total_time": 0,
-                "avg_time": 0
-            }
-        
-        # Update metrics
-        self.metrics["requests"][key]["count"] += 1
-        self.metrics["requests"][key]["total_time"] += processing_time
-        self.metrics["requests"][key]["avg_time"] = (
-            self.metrics["requests"][key]["total_time"] / 
-            self.metrics["requests"][key]["count"]
-        )
-        
-        # Track status codes
-        if status_code not in self.metrics["requests"][key]["status_codes"]:
-            self.metrics["requests"][key]["status_codes"][status_code] = 0
-        self.metrics["requests"][key]["status_codes"][status_code] += 1
-        
-        # Log request
-        logger.info(f"Request: {method} {endpoint} - Status: {status_code} - Time: {processing_time:.2f}s")
-    
+        # Single lookup; avg_time is derived lazily in get_metrics()
+        metrics["requests"][_reqkey(method, endpoint)].inc(processing_time, status_code)
+
+        _mark_dirty()
+
+        # Log request (%-style args are only formatted when INFO is enabled)
+        logger.info("Request: %s %s - Status: %d - Time: %.2fs", method, endpoint, status_code, processing_time)
+
     def track_error(self, error_type: str, error_message: str, context: Optional[Dict[str, Any]] = None):
         """Track error metrics"""
-        # Initialize if not exists
-        if error_type not in self.metrics["errors"]:
-            self.metrics["errors"][error_type] = {
-                "count": 0,
-                "last_occurrence": None,
-                "contexts": []
-            }
-        
-        # Update metrics
-        self.metrics["errors"][error_type]["count"] += 1
-        self.metrics["errors"][error_type]["last_occurrence"] = datetime.now().isoformat()
-        
+        stat = metrics["errors"][error_type]
+
+        # Update metrics; timestamps stay raw floats until get_metrics() formats them
+        now = time.time()
+        stat.count += 1
+        stat.last_occurrence = now
+
         # Store context if provided
         if context:
-            self.metrics["errors"][error_type]["contexts"].append({
-                "timestamp": datetime.now().isoformat(),
+            stat.contexts.append({
+                "timestamp": now,
                 "message": error_message,
                 "context": context
             })
-        
+
+        _mark_dirty()
+
         # Log error
-        logger.error(f"Error: {error_type} - {error_message}")
-    
+        logger.error("Error: %s - %s", error_type, error_message)
+
     def track_processing_time(self, operation: str, processing_time: float):
         """Track processing time for operations"""
-        # Initialize if not exists
-        if operation not in self.metrics["processing_times"]:
-            self.metrics["processing_times"][operation] = {
-                "count": 0,
-                "total_time": 0,
-                "avg_time": 0,
-                "min_time": float('inf'),
-                "max_time": 0
-            }
-        
-        # Update metrics
-        self.metrics["processing_times"][operation]["count"] += 1
-# Metrics storage
-metrics = {
-    "requests": {},
-    "errors": {},
-    "processing_times": {},
-    "custom": {}
-}
+        stat = metrics["processing_times"][operation]
 
-def track_request(endpoint: str, method: str, status_code: int, processing_time: float):
-    """Track API request metrics"""
-    key = f"{method}:{endpoint}"
-    
-    # Initialize if not exists
-    if key not in metrics["requests"]:
-        metrics["requests"][key] = {
-            "count": 0,
-            "status_codes": {},
-            "total_time": 0,
-            "avg_time": 0
-        }
-    
-    # Update metrics
-    metrics["requests"][key]["count"] += 1
-    metrics["requests"][key]["total_time"] += processing_time
-    metrics["requests"][key]["avg_time"] = metrics["requests"][key]["total_time"] / metrics["requests"][key]["count"]
-    
-    # Track status codes
-    if status_code not in metrics["requests"][key]["status_codes"]:
-        metrics["requests"][key]["status_codes"][status_code] = 0
-    metrics["requests"][key]["status_codes"][status_code] += 1
-    
-    # Log request
-    logger.info(f"Request: {method} {endpoint} - Status: {status_code} - Time: {processing_time:.2f}s")
-
-def track_error(error_type: str, error_message: str, context: Optional[Dict[str, Any]] = None):
-    """Track error metrics"""
-    # Initialize if not exists
-    if error_type not in metrics["errors"]:
-        metrics["errors"][error_type] = {
-            "count": 0,
-            "last_occurrence": None,
-            "contexts": []
-        }
-    
-    # Update metrics
-    metrics["errors"][error_type]["count"] += 1
-    metrics["errors"][error_type]["last_occurrence"] = datetime.now().isoformat()
-    
-    # Store context if provided
-    if context:
-        metrics["errors"][error_type]["contexts"].append({
-            "timestamp": datetime.now().isoformat(),
-            "message": error_message,
-            "context": context
-        })
-    
-    # Log error
-    logger.error(f"Error: {error_type} - {error_message}")
-
-def track_processing_time(operation: str, processing_time: float):
-    """Track processing time for operations"""
-    # Initialize if not exists
-    if operation not in metrics["processing_times"]:
-        metrics["processing_times"][operation] = {
-            "count": 0,
-            "total_time": 0,
-            "avg_time": 0,
-            "min_time": float('inf'),
-            "max_time": 0
-        }
-    
-    # Update metrics
-    metrics["processing_times"][operation]["count"] += 1
-    metrics["processing_times"][operation]["total_time"] += processing_time
-    metrics["processing_times"][operation]["avg_time"] = metrics["processing_times"][operation]["total_time"] / metrics["processing_times"][operation]["count"]
-    metrics["processing_times"][operation]["min_time"] = min(metrics["processing_times"][operation]["min_time"], processing_time)
-    metrics["processing_times"][operation]["max_time"] = max(metrics["processing_times"][operation]["max_time"], processing_time)
-    
-    # Log processing time
-    logger.info(f"Processing time for {operation}: {processing_time:.2f}s")
-
-def track_custom_metric(name: str, value: Any, tags: Optional[Dict[str, str]] = None):
-    """Track custom metrics"""
-    # Initialize if not exists
-    if name not in metrics["custom"]:
-        metrics["custom"][name] = {
-            "values": [],
-            "tags": {}
+        # Update metrics; avg_time is pure derived data, computed in the
+        # snapshot builder instead of re-divided on every event
+        stat.count += 1
+        stat.total_time += processing_time
+        stat.min_time = min(stat.min_time, processing_time)
+        stat.max_time = max(stat.max_time, processing_time)
+
+        _mark_dirty()
+
+        # Log processing time
+        logger.info("Processing time for %s: %.2fs", operation, processing_time)
+
+    def bulk_track_processing_time(self, operation: str, times) -> None:
+        """Fold a batch of processing-time samples into one stats update.
+
+        For replay/import paths this aggregates the whole batch with
+        C-level builtins (len/sum/min/max) and touches the stats entry
+        once, instead of paying the per-sample update loop.
+        """
+        if not isinstance(times, (list, tuple)):
+            times = list(times)
+        if not times:
+            return
+
+        n = len(times)
+        total = sum(times)
+        lo = min(times)
+        hi = max(times)
+
+        stat = metrics["processing_times"][operation]
+        stat.count += n
+        stat.total_time += total
+        stat.min_time = min(stat.min_time, lo)
+        stat.max_time = max(stat.max_time, hi)
+
+        _mark_dirty()
+        logger.info("Bulk processing times for %s: %d samples", operation, n)
+
+    def track_custom_metric(self, name: str, value: Any, tags: Optional[Dict[str, str]] = None):
+        """Track custom metrics"""
+        entry = metrics["custom"][name]
+
+        # Numeric samples go into a packed double array (two C-level appends,
+        # no per-sample dict); everything else keeps the dict path
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            numeric = entry["numeric"]
+            numeric.append(time.time())
+            numeric.append(value)
+            # Trim in one slice once the array holds twice the cap, so the
+            # amortized cost stays O(1) per sample
+            if len(numeric) > 4 * MAX_CUSTOM_VALUES:
+                del numeric[:len(numeric) - 2 * MAX_CUSTOM_VALUES]
+        else:
+            entry["values"].append({
+                "timestamp": time.time(),
+                "value": value
+            })
+
+        # Update tags if provided
+        if tags:
+            entry["tags"].update(tags)
+
+        _mark_dirty()
+
+        # Log custom metric
+        logger.info("Custom metric: %s = %s", name, value)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get all metrics as a plain-dict snapshot.
+
+        The snapshot is cached and only rebuilt after a write has flipped
+        the dirty flag, so frequent scrapes of unchanged metrics are a
+        dict return."""
+        global _snapshot, _snapshot_json, _snapshot_dirty
+        if not _snapshot_dirty and _snapshot is not None:
+            return _snapshot
+        with _snapshot_lock:
+            if not _snapshot_dirty and _snapshot is not None:
+                return _snapshot
+            snapshot = self._build_snapshot()
+            _snapshot = snapshot
+            # Serialized lazily by get_metrics_json(); drop the stale bytes
+            _snapshot_json = None
+            _snapshot_dirty = False
+            return snapshot
+
+    def get_metrics_json(self) -> bytes:
+        """Get the metrics snapshot as serialized JSON bytes.
+
+        HTTP scrapers can return these bytes directly; serialization is
+        amortized across scrapes the same way the dict snapshot is."""
+        global _snapshot_json
+        snapshot = self.get_metrics()
+        if _snapshot_json is None:
+            _snapshot_json = _dumps(snapshot)
+        return _snapshot_json
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": {
+                key: {
+                    "count": stat.count,
+                    "status_codes": dict(stat.status_codes),
+                    "total_time": stat.total_time,
+                    "avg_time": stat.total_time / stat.count if stat.count else 0
+                }
+                for key, stat in metrics["requests"].items()
+            },
+            "errors": {
+                error_type: {
+                    "count": err.count,
+                    "last_occurrence": (
+                        _iso(err.last_occurrence)
+                        if err.last_occurrence else None
+                    ),
+                    "contexts": [
+                        {
+                            "timestamp": _iso(ctx["timestamp"]),
+                            "message": ctx["message"],
+                            "context": ctx["context"]
+                        }
+                        for ctx in err.contexts
+                    ]
+                }
+                for error_type, err in metrics["errors"].items()
+            },
+            "processing_times": {
+                operation: {
+                    "count": stat.count,
+                    "total_time": stat.total_time,
+                    "avg_time": stat.total_time / stat.count if stat.count else 0,
+                    "min_time": stat.min_time,
+                    "max_time": stat.max_time
+                }
+                for operation, stat in metrics["processing_times"].items()
+            },
+            "custom": {
+                name: {
+                    "values": [
+                        {
+                            "timestamp": _iso(entry["numeric"][i]),
+                            "value": entry["numeric"][i + 1]
+                        }
+                        for i in range(0, len(entry["numeric"]), 2)
+                    ] + [
+                        {
+                            "timestamp": _iso(sample["timestamp"]),
+                            "value": sample["value"]
+                        }
+                        for sample in entry["values"]
+                    ],
+                    "tags": entry["tags"]
+                }
+                for name, entry in metrics["custom"].items()
+            }
         }
-    
-    # Update metrics
-    metrics["custom"][name]["values"].append({
-        "timestamp": datetime.now().isoformat(),
-        "value": value
-    })
-    
-    # Update tags if provided
-    if tags:
-        metrics["custom"][name]["tags"].update(tags)
-    
-    # Log custom metric
-    logger.info(f"Custom metric: {name} = {value}")
-
-def get_metrics() -> Dict[str, Any]:
-    """Get all metrics"""
-    return metrics
-
-def reset_metrics():
-    """Reset all metrics"""
-    global metrics
-    metrics = {
-        "requests": {},
-        "errors": {},
-        "processing_times": {},
-        "custom": {}
-    }
-    logger.info("Metrics reset")
+
+    def reset_metrics(self):
+        """Reset all metrics"""
+        # Clear in place so anyone holding a reference to the store (or
+        # its sections) keeps seeing live data instead of a stale dict
+        metrics["requests"].clear()
+        metrics["errors"].clear()
+        metrics["processing_times"].clear()
+        metrics["custom"].clear()
+        _mark_dirty()
+        logger.info("Metrics reset")
+
+
+class RequestBatch:
+    """Task-local request accumulator for high-fanout async code.
+
+    Each task records into its own batch with no shared-store writes,
+    then folds everything into the global metrics in one flush() —
+    converting N contended updates (and N snapshot invalidations) into
+    one. Typical use: create one per gather() fan-out, flush at the end.
+    """
+    __slots__ = ("_acc",)
+
+    def __init__(self):
+        self._acc: Dict[str, _ReqStat] = {}
+
+    def track_request(self, endpoint: str, method: str, status_code: int, processing_time: float):
+        key = _reqkey(method, endpoint)
+        local = self._acc.get(key)
+        if local is None:
+            local = self._acc[key] = _ReqStat()
+        local.inc(processing_time, status_code)
+
+    def flush(self):
+        if not self._acc:
+            return
+        requests = metrics["requests"]
+        for key, local in self._acc.items():
+            stat = requests[key]
+            stat.count += local.count
+            stat.total_time += local.total_time
+            stat.status_codes.update(local.status_codes)
+        self._acc.clear()
+        _mark_dirty()
+
+
+# Shared singleton; the module-level functions are its bound methods so
+# there is exactly one dispatch path for every caller
+metrics_tracker = MetricsTracker()
+
+track_request = metrics_tracker.track_request
+track_error = metrics_tracker.track_error
+track_processing_time = metrics_tracker.track_processing_time
+bulk_track_processing_time = metrics_tracker.bulk_track_processing_time
+track_custom_metric = metrics_tracker.track_custom_metric
+get_metrics = metrics_tracker.get_metrics
+get_metrics_json = metrics_tracker.get_metrics_json
+reset_metrics = metrics_tracker.reset_metrics
 
 # Decorator to track function execution time
 def track_time(operation_name: Optional[str] = None):
     """Decorator to track function execution time"""
     def decorator(func):
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = await func(*args, **kwargs)
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                # Use function name if operation_name is not provided
-                op_name = operation_name or func.__name__
-                track_processing_time(op_name, processing_time)
-                
-                return result
-            except Exception as e:
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                # Track error
-                op_name = operation_name or func.__name__
-                track_error(
-                    type(e).__name__,
-                    str(e),
-                    {"operation": op_name, "processing_time": processing_time}
-                )
-                
-                raise
-        
-        @functools.wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = func(*args, **kwargs)
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                # Use function name if operation_name is not provided
-                op_name = operation_name or func.__name__
-                track_processing_time(op_name, processing_time)
-                
-                return result
-            except Exception as e:
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                # Track error
-                op_name = operation_name or func.__name__
-                track_error(
-                    type(e).__name__,
-                    str(e),
-                    {"operation": op_name, "processing_time": processing_time}
-                )
-                
-                raise
-        
-        # Return the appropriate wrapper based on whether the function is async or not
+        # The operation name never changes for a decorated function;
+        # resolve it once here instead of on every call
+        op_name = operation_name or func.__name__
+
+        # Only build the wrapper that will actually be returned; defining
+        # both doubled the bytecode compiled per decorated function
         if asyncio.iscoroutinefunction(func):
-            return async_wrapper
+            @functools.wraps(func)
+            async def wrapper(*args, _op=op_name, _pt=track_processing_time,
+                              _te=track_error, **kwargs):
+                # Monotonic integer clock: immune to NTP jumps and cheaper
+                # than time.time(); read exactly once per path via finally
+                start_ns = time.perf_counter_ns()
+                error = None
+                try:
+                    return await func(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    processing_time = (time.perf_counter_ns() - start_ns) * 1e-9
+                    if error is None:
+                        _pt(_op, processing_time)
+                    else:
+                        _te(
+                            type(error).__name__,
+                            str(error),
+                            {"operation": _op, "processing_time": processing_time}
+                        )
         else:
-            return sync_wrapper
-    
-    return decorator 
\ No newline at end of file
+            @functools.wraps(func)
+            def wrapper(*args, _op=op_name, _pt=track_processing_time,
+                        _te=track_error, **kwargs):
+                start_ns = time.perf_counter_ns()
+                error = None
+                try:
+                    return func(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    processing_time = (time.perf_counter_ns() - start_ns) * 1e-9
+                    if error is None:
+                        _pt(_op, processing_time)
+                    else:
+                        _te(
+                            type(error).__name__,
+                            str(error),
+                            {"operation": _op, "processing_time": processing_time}
+                        )
+
+        return wrapper
+
+    return decorator
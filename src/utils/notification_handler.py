@@ -1,21 +1,65 @@
 import os
-import smtplib
+import asyncio
+import hashlib
 import logging
-import json
-import aiohttp
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+import aiosmtplib
 from typing import Dict, Any, List, Optional, Set
-from datetime import datetime, timedelta
-from twilio.rest import Client
+from datetime import datetime
 from src.utils.logger import get_logger
+from src.utils._json import dumps as _dumps
+
+# aiohttp and twilio are imported lazily at their first point of use;
+# both pull in dozens of submodules that deployments without Slack or
+# SMS configured never need, and deferring them trims cold-start time
 
 # Get logger
 logger = get_logger(__name__)
 
+class TokenBucket:
+    """Constant-time rate limiter: tokens refill continuously over time.
+
+    Each allow() is two float operations — no history list to scan or
+    expire, regardless of traffic volume.
+    """
+
+    __slots__ = ("tokens", "last", "rate", "cap")
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.cap = capacity
+        self.rate = refill_per_sec
+        self.tokens = capacity
+        self.last = time.monotonic()
+
+    def allow(self, n: float = 1.0) -> bool:
+        """Debit n tokens if available, refilling for elapsed time first"""
+        now = time.monotonic()
+        self.tokens = min(self.cap, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+
 class NotificationHandler:
     """Handler for sending notifications about important events"""
-    
+
+    # Channel sets are immutable; frozensets are shared across recipients
+    # and give allocation-free membership checks on the send paths
+    _VALID_CHANNELS = frozenset({"slack", "email", "sms"})
+    _DEFAULT_CHANNELS = _VALID_CHANNELS
+
+    # Translation tables for the ADMIN_PREFS_* env key transforms;
+    # str.translate scans the recipient string once in C instead of one
+    # pass per .replace()
+    _EMAIL_TRANS = str.maketrans({"@": "_", ".": "_"})
+    _PHONE_TRANS = str.maketrans({"+": "", "-": "_"})
+
+    # SMS prefix lookup tables, replacing per-send if/elif chains
+    _PRIO_PREFIX = {"high": "🚨 ", "medium": "⚠️ ", "low": "ℹ️ "}
+    _TYPE_PREFIX = {"health_alert": "HEALTH: ", "error_alert": "ERROR: ", "metrics_alert": "METRICS: "}
+
     def __init__(self):
         """Initialize the notification handler"""
         self.slack_webhook_url = os.getenv("SLACK_WEBHOOK_URL")
@@ -32,10 +76,19 @@ class NotificationHandler:
         self.twilio_auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self.twilio_from_number = os.getenv("TWILIO_FROM_NUMBER")
         self.admin_phone_numbers = os.getenv("ADMIN_PHONE_NUMBERS", "").split(",")
+        self._env_prefix = f"[{self.environment.upper()}] "
+
+        # Dashboard deep links, resolved once instead of per alert
+        self._dashboard_url = os.getenv("DASHBOARD_URL", "http://localhost:8000")
+        self._health_url = f"{self._dashboard_url}/health"
+        self._errors_url = f"{self._dashboard_url}/errors"
+        self._metrics_url = f"{self._dashboard_url}/metrics"
         
         # Initialize Twilio client if credentials are available
         self.twilio_client = None
         if self.twilio_account_sid and self.twilio_auth_token:
+            from twilio.rest import Client
+
             self.twilio_client = Client(self.twilio_account_sid, self.twilio_auth_token)
         
         self.notification_thresholds = {
@@ -47,119 +100,222 @@ class NotificationHandler:
         self.consecutive_errors = 0
         self.last_notification_time = {}
         
-        # Rate limiting configuration
+        # Rate limiting configuration (monotonic timestamps: cheaper than
+        # datetime.now() and immune to wall-clock jumps)
         self.sms_rate_limit = int(os.getenv("SMS_RATE_LIMIT", "10"))  # Max SMS per hour
         self.sms_cooldown_minutes = int(os.getenv("SMS_COOLDOWN_MINUTES", "30"))  # Cooldown between SMS
-        self.sms_notification_history = {}  # Track SMS notifications by type
-        self.last_sms_time = {}  # Track last SMS time by recipient
+        # Token buckets make each rate-limit decision two float ops:
+        # per-recipient buckets enforce the cooldown, per-type buckets
+        # enforce the hourly budget
+        self._buckets_by_recipient: Dict[str, TokenBucket] = {}
+        self._buckets_by_type: Dict[str, TokenBucket] = {}
         
         # Notification preferences
         self.notification_preferences = self._load_notification_preferences()
+
+        # Preference-filtered recipient lists, computed once so the hot
+        # send paths don't re-filter per call; update_preferences rebuilds
+        self._rebuild_recipient_lists()
+
+        # Pooled SMTP connection, reused across sends; the lock serializes
+        # access since SMTP sessions handle one transaction at a time
+        self._smtp_conn: Optional[aiosmtplib.SMTP] = None
+        self._smtp_lock = asyncio.Lock()
+
+        # Shared HTTP session (created lazily from an async context so it
+        # binds to the running loop); reuses the connector's DNS cache and
+        # keep-alive TLS connection to the Slack webhook host
+        self._http_session: Optional["aiohttp.ClientSession"] = None
+        # Slack payloads are serialized with _dumps and posted as raw
+        # bytes; the header dict is shared across requests
+        self._json_headers = {"Content-Type": "application/json"}
+
+        # SMS dispatch queue and worker, started lazily on first send so
+        # bursts of alerts drain at a controlled rate instead of hitting
+        # Twilio with one API call per producer
+        self._sms_queue: Optional[asyncio.Queue] = None
+        self._sms_worker_task: Optional[asyncio.Task] = None
+        self._sms_send_semaphore: Optional[asyncio.Semaphore] = None
+        self._sms_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Alert-storm dedup: identical payloads within the window are
+        # suppressed so one incident doesn't emit the same alert per tick
+        self.dedup_window_seconds = int(os.getenv("NOTIFICATION_DEDUP_WINDOW", "60"))
+        self._dedup: Dict[str, float] = {}
     
-    def _load_notification_preferences(self) -> Dict[str, Dict[str, Set[str]]]:
+    def _load_notification_preferences(self) -> Dict[str, frozenset]:
         """Load notification preferences from environment or use defaults"""
         preferences = {}
-        
-        # Default preferences - all channels enabled
-        default_channels = {"slack", "email", "sms"}
-        
+
         # Load admin preferences from environment
         for email in self.admin_emails:
             if not email:
                 continue
-                
+
             # Get preferences from environment variables
-            pref_key = f"ADMIN_PREFS_{email.replace('@', '_').replace('.', '_').upper()}"
+            pref_key = f"ADMIN_PREFS_{email.translate(self._EMAIL_TRANS).upper()}"
             channels_str = os.getenv(pref_key, "")
-            
+
             if channels_str:
-                # Parse channels from environment
-                channels = set(channels_str.split(","))
-                # Validate channels
-                valid_channels = {"slack", "email", "sms"}
-                channels = channels.intersection(valid_channels)
-                preferences[email] = channels
+                # Parse and validate channels from environment
+                preferences[email] = self._VALID_CHANNELS.intersection(channels_str.split(","))
             else:
-                # Use default preferences
-                preferences[email] = default_channels.copy()
-        
+                # Frozensets are immutable, so the default is shared
+                preferences[email] = self._DEFAULT_CHANNELS
+
         # Load phone number preferences
         for phone in self.admin_phone_numbers:
             if not phone:
                 continue
-                
+
             # Get preferences from environment variables
-            pref_key = f"ADMIN_PREFS_{phone.replace('+', '').replace('-', '_')}"
+            pref_key = f"ADMIN_PREFS_{phone.translate(self._PHONE_TRANS)}"
             channels_str = os.getenv(pref_key, "")
-            
+
             if channels_str:
-                # Parse channels from environment
-                channels = set(channels_str.split(","))
-                # Validate channels
-                valid_channels = {"slack", "email", "sms"}
-                channels = channels.intersection(valid_channels)
-                preferences[phone] = channels
+                # Parse and validate channels from environment
+                preferences[phone] = self._VALID_CHANNELS.intersection(channels_str.split(","))
             else:
-                # Use default preferences
-                preferences[phone] = default_channels.copy()
-        
+                # Frozensets are immutable, so the default is shared
+                preferences[phone] = self._DEFAULT_CHANNELS
+
         return preferences
-    
-    def get_preferred_channels(self, recipient: str) -> Set[str]:
+
+    def _rebuild_recipient_lists(self) -> None:
+        """Recompute the preference-filtered default recipient tuples"""
+        self._email_recipients = tuple(
+            r for r in self.admin_emails
+            if r and "email" in self.notification_preferences.get(r, self._DEFAULT_CHANNELS)
+        )
+        self._sms_recipients = tuple(
+            r for r in self.admin_phone_numbers
+            if r and "sms" in self.notification_preferences.get(r, self._DEFAULT_CHANNELS)
+        )
+
+    def get_preferred_channels(self, recipient: str) -> frozenset:
         """Get preferred notification channels for a recipient"""
-        return self.notification_preferences.get(recipient, {"slack", "email", "sms"})
-    
+        return self.notification_preferences.get(recipient, self._DEFAULT_CHANNELS)
+
     def update_preferences(self, recipient: str, channels: Set[str]) -> bool:
         """Update notification preferences for a recipient"""
         # Validate channels
-        valid_channels = {"slack", "email", "sms"}
-        channels = channels.intersection(valid_channels)
-        
+        channels = frozenset(channels) & self._VALID_CHANNELS
+
         if not channels:
             logger.warning(f"Cannot set empty channels for {recipient}")
             return False
-        
+
         self.notification_preferences[recipient] = channels
+        self._rebuild_recipient_lists()
         logger.info(f"Updated notification preferences for {recipient}: {channels}")
         return True
 
+    def _should_emit(self, channel: str, *parts: Any) -> bool:
+        """Return False if an identical alert already went out recently.
+
+        The fingerprint covers the channel and payload, so a repeating
+        alert is coalesced to one emit per window while any change in
+        content goes out immediately.
+        """
+        raw = "|".join((channel, *map(str, parts)))
+        fingerprint = hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+        now = time.monotonic()
+        last = self._dedup.get(fingerprint)
+        if last is not None and now - last < self.dedup_window_seconds:
+            return False
+
+        # Opportunistically drop expired fingerprints so storms don't
+        # leave the table growing forever
+        if len(self._dedup) > 1024:
+            cutoff = now - self.dedup_window_seconds
+            self._dedup = {fp: ts for fp, ts in self._dedup.items() if ts >= cutoff}
+
+        self._dedup[fingerprint] = now
+        return True
+
     def _can_send_sms(self, notification_type: str, recipient: str) -> bool:
-        """Check if SMS can be sent based on rate limiting rules"""
-        current_time = datetime.now()
-        
-        # Check cooldown period for this recipient
-        if recipient in self.last_sms_time:
-            time_since_last = current_time - self.last_sms_time[recipient]
-            if time_since_last < timedelta(minutes=self.sms_cooldown_minutes):
-                logger.info(f"SMS cooldown active for {recipient}, {self.sms_cooldown_minutes - time_since_last.seconds // 60} minutes remaining")
-                return False
-        
-        # Check rate limit for this notification type
-        if notification_type in self.sms_notification_history:
-            # Clean up old entries
-            self.sms_notification_history[notification_type] = [
-                t for t in self.sms_notification_history[notification_type]
-                if current_time - t < timedelta(hours=1)
-            ]
-            
-            # Check if rate limit is exceeded
-            if len(self.sms_notification_history[notification_type]) >= self.sms_rate_limit:
-                logger.info(f"SMS rate limit exceeded for {notification_type}")
-                return False
-        
+        """Check and debit the SMS rate-limit buckets.
+
+        A passing check consumes the tokens, so no separate bookkeeping
+        step is needed after the send. The per-recipient cooldown is
+        checked first so a recipient stuck on cooldown can't drain the
+        shared hourly budget; if the hourly bucket then rejects, the
+        cooldown token is refunded — only SMS actually cleared for
+        sending count against either limit.
+        """
+        recipient_bucket = self._buckets_by_recipient.setdefault(
+            recipient,
+            TokenBucket(1.0, 1.0 / (self.sms_cooldown_minutes * 60))
+        )
+        if not recipient_bucket.allow():
+            logger.info(f"SMS cooldown active for {recipient}")
+            return False
+
+        type_bucket = self._buckets_by_type.setdefault(
+            notification_type,
+            TokenBucket(self.sms_rate_limit, self.sms_rate_limit / 3600.0)
+        )
+        if not type_bucket.allow():
+            logger.info(f"SMS rate limit exceeded for {notification_type}")
+            recipient_bucket.tokens = min(recipient_bucket.cap, recipient_bucket.tokens + 1.0)
+            return False
+
         return True
 
-    def _record_sms_sent(self, notification_type: str, recipient: str):
-        """Record that an SMS was sent"""
-        current_time = datetime.now()
-        
-        # Record time for this recipient
-        self.last_sms_time[recipient] = current_time
-        
-        # Record notification type
-        if notification_type not in self.sms_notification_history:
-            self.sms_notification_history[notification_type] = []
-        self.sms_notification_history[notification_type].append(current_time)
+    async def _get_smtp(self) -> aiosmtplib.SMTP:
+        """Return an open, authenticated SMTP connection.
+
+        Reconnecting per email costs a TCP+TLS+AUTH exchange each time,
+        so the connection is kept warm; a NOOP probe detects a dropped
+        session and triggers a lazy reconnect.
+        """
+        conn = self._smtp_conn
+        if conn is not None:
+            try:
+                await conn.noop()
+                return conn
+            except Exception:
+                self._smtp_conn = None
+
+        conn = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port, start_tls=False)
+        await conn.connect()
+        await conn.starttls()
+        await conn.login(self.smtp_username, self.smtp_password)
+        self._smtp_conn = conn
+        return conn
+
+    async def _get_http(self) -> "aiohttp.ClientSession":
+        """Return the shared HTTP session, creating it on first use"""
+        if self._http_session is None or self._http_session.closed:
+            import aiohttp
+
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=5),
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+        return self._http_session
+
+    async def close(self) -> None:
+        """Release pooled connections and background tasks held by the handler"""
+        if self._sms_worker_task is not None:
+            if self._sms_queue is not None:
+                # Let already-queued sends drain before shutting down
+                await self._sms_queue.join()
+            self._sms_worker_task.cancel()
+            try:
+                await self._sms_worker_task
+            except asyncio.CancelledError:
+                pass
+            self._sms_worker_task = None
+        if self._smtp_conn is not None:
+            try:
+                await self._smtp_conn.quit()
+            except Exception:
+                pass
+            self._smtp_conn = None
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+            self._http_session = None
 
     async def send_email_notification(
         self, 
@@ -173,34 +329,46 @@ class NotificationHandler:
             return False
 
         try:
-            recipients = recipients or self.admin_emails
-            if not recipients:
-                logger.warning("No recipients specified for email notification")
-                return False
-            
-            # Filter recipients based on preferences
-            filtered_recipients = [
-                r for r in recipients 
-                if "email" in self.get_preferred_channels(r)
-            ]
-            
+            if recipients is None:
+                # Default recipients are pre-filtered at init time
+                filtered_recipients = self._email_recipients
+            else:
+                # Filter explicit recipients based on preferences
+                filtered_recipients = [
+                    r for r in recipients
+                    if "email" in self.get_preferred_channels(r)
+                ]
+
             if not filtered_recipients:
                 logger.info("No recipients with email preferences")
                 return False
-            
-            msg = MIMEMultipart()
-            msg["From"] = self.from_email
-            msg["To"] = ", ".join(filtered_recipients)
-            msg["Subject"] = f"[{self.environment.upper()}] {subject}"
-            
-            msg.attach(MIMEText(message, "plain"))
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
-            
-            logger.info(f"Email notification sent to {msg['To']}")
+
+            if not self._should_emit("email", subject, message):
+                logger.info(f"Email notification coalesced (duplicate within window): {subject}")
+                return False
+
+            # Render the message bytes directly: the bodies here are
+            # always short plain text, so building a MIMEMultipart and
+            # running it through email.generator per send is pure overhead
+            to_header = ", ".join(filtered_recipients)
+            payload = (
+                f"From: {self.from_email}\r\n"
+                f"To: {to_header}\r\n"
+                f"Subject: {self._env_prefix}{subject}\r\n"
+                "MIME-Version: 1.0\r\n"
+                "Content-Type: text/plain; charset=utf-8\r\n"
+                "Content-Transfer-Encoding: 8bit\r\n"
+                "\r\n"
+                f"{message}"
+            ).encode("utf-8")
+
+            # Reuse the warm authenticated connection; one transaction
+            # at a time under the lock
+            async with self._smtp_lock:
+                smtp = await self._get_smtp()
+                await smtp.sendmail(self.from_email, filtered_recipients, payload)
+
+            logger.info(f"Email notification sent to {to_header}")
             return True
         
         except Exception as e:
@@ -213,6 +381,10 @@ class NotificationHandler:
             logger.warning("Slack webhook URL not configured")
             return False
 
+        if not self._should_emit("slack", level, message):
+            logger.info("Slack notification coalesced (duplicate within window)")
+            return False
+
         try:
             payload = {
                 "text": f"[{level.upper()}] {message}",
@@ -220,19 +392,50 @@ class NotificationHandler:
                 "icon_emoji": ":robot_face:"
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.slack_webhook_url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info(f"Slack notification sent: {message}")
-                        return True
-                    else:
-                        logger.error(f"Failed to send Slack notification: {response.status}")
-                        return False
+            session = await self._get_http()
+            async with session.post(
+                self.slack_webhook_url, data=_dumps(payload), headers=self._json_headers
+            ) as response:
+                if response.status == 200:
+                    logger.info(f"Slack notification sent: {message}")
+                    return True
+                else:
+                    logger.error(f"Failed to send Slack notification: {response.status}")
+                    return False
 
         except Exception as e:
             logger.error(f"Error sending Slack notification: {str(e)}")
             return False
-    
+
+    async def _post_slack_blocks(self, attachments: List[Dict[str, Any]]) -> bool:
+        """Post several alerts as one Slack message with attachments"""
+        if not self.slack_webhook_url:
+            logger.warning("Slack webhook URL not configured")
+            return False
+
+        try:
+            payload = {
+                "text": f"*{len(attachments)} alert(s) from metrics check*",
+                "attachments": attachments,
+                "username": "WhatsApp Bot Monitor",
+                "icon_emoji": ":robot_face:"
+            }
+
+            session = await self._get_http()
+            async with session.post(
+                self.slack_webhook_url, data=_dumps(payload), headers=self._json_headers
+            ) as response:
+                if response.status == 200:
+                    logger.info(f"Slack notification sent with {len(attachments)} attachment(s)")
+                    return True
+                else:
+                    logger.error(f"Failed to send Slack notification: {response.status}")
+                    return False
+
+        except Exception as e:
+            logger.error(f"Error sending Slack notification: {str(e)}")
+            return False
+
     async def send_sms_notification(
         self, 
         message: str, 
@@ -248,21 +451,24 @@ class NotificationHandler:
             return False
 
         try:
-            recipients = recipients or self.admin_phone_numbers
-            if not recipients:
-                logger.warning("No phone numbers configured for SMS notifications")
-                return False
-            
-            # Filter recipients based on preferences
-            filtered_recipients = [
-                r for r in recipients 
-                if "sms" in self.get_preferred_channels(r)
-            ]
-            
+            if recipients is None:
+                # Default recipients are pre-filtered at init time
+                filtered_recipients = self._sms_recipients
+            else:
+                # Filter explicit recipients based on preferences
+                filtered_recipients = [
+                    r for r in recipients
+                    if "sms" in self.get_preferred_channels(r)
+                ]
+
             if not filtered_recipients:
                 logger.info("No recipients with SMS preferences")
                 return False
 
+            if not self._should_emit("sms", notification_type, message):
+                logger.info("SMS notification coalesced (duplicate within window)")
+                return False
+
             # Format message based on priority
             formatted_message = self._format_sms_message(
                 message, 
@@ -272,31 +478,72 @@ class NotificationHandler:
                 link_url
             )
 
-            success = False
+            # Hand the sends to the background worker; a burst of alerts
+            # enqueues instantly instead of fanning out N parallel Twilio
+            # calls from the caller's coroutine
+            self._ensure_sms_worker()
+            accepted = False
             for phone_number in filtered_recipients:
-                # Check rate limiting
+                try:
+                    self._sms_queue.put_nowait((phone_number, formatted_message, notification_type))
+                    accepted = True
+                except asyncio.QueueFull:
+                    logger.warning(f"SMS queue full, dropping notification to {phone_number}")
+
+            return accepted
+
+        except Exception as e:
+            logger.error(f"Failed to send SMS notification: {str(e)}")
+            return False
+
+    def _ensure_sms_worker(self) -> None:
+        """Start the SMS queue and worker task on first use.
+
+        Created lazily so the queue binds to the running event loop and
+        handlers constructed outside one stay importable.
+        """
+        loop = asyncio.get_running_loop()
+        # The queue, semaphore and worker belong to one event loop. A
+        # worker task stranded on a replaced loop is never done(), so
+        # without this check sends would enqueue into a queue nothing
+        # drains — start fresh on the current loop.
+        if self._sms_loop is not loop:
+            self._sms_loop = loop
+            self._sms_queue = None
+            self._sms_worker_task = None
+        if self._sms_queue is None:
+            self._sms_queue = asyncio.Queue(maxsize=1000)
+            self._sms_send_semaphore = asyncio.Semaphore(4)
+        if self._sms_worker_task is None or self._sms_worker_task.done():
+            self._sms_worker_task = asyncio.create_task(self._sms_worker())
+
+    async def _sms_worker(self) -> None:
+        """Drain queued SMS jobs, honoring rate limits as they dequeue.
+
+        Decouples producer bursts from Twilio throughput: callers enqueue
+        and return, while the semaphore caps parallel API calls.
+        """
+        while True:
+            phone_number, body, notification_type = await self._sms_queue.get()
+            try:
                 if not self._can_send_sms(notification_type, phone_number):
                     logger.info(f"Skipping SMS to {phone_number} due to rate limiting")
                     continue
-                
-                # Send the SMS
-                self.twilio_client.messages.create(
-                    body=formatted_message,
-                    from_=self.twilio_from_number,
-                    to=phone_number
-                )
-                
-                # Record that SMS was sent
-                self._record_sms_sent(notification_type, phone_number)
+                async with self._sms_send_semaphore:
+                    # The Twilio client is synchronous; run the send on a
+                    # worker thread so the event loop stays free
+                    await asyncio.to_thread(
+                        self.twilio_client.messages.create,
+                        body=body,
+                        from_=self.twilio_from_number,
+                        to=phone_number
+                    )
                 logger.info(f"SMS notification sent to {phone_number}")
-                success = True
-            
-            return success
+            except Exception as e:
+                logger.error(f"Failed to send SMS to {phone_number}: {e}")
+            finally:
+                self._sms_queue.task_done()
 
-        except Exception as e:
-            logger.error(f"Failed to send SMS notification: {str(e)}")
-            return False
-    
     def _format_sms_message(
         self, 
         message: str, 
@@ -306,245 +553,305 @@ class NotificationHandler:
         link_url: Optional[str] = None
     ) -> str:
         """Format SMS message with appropriate styling and information density"""
-        # Start with environment prefix
-        formatted = f"[{self.environment.upper()}] "
-        
-        # Add priority indicator
-        if priority == "high":
-            formatted += "🚨 "
-        elif priority == "medium":
-            formatted += "⚠️ "
-        elif priority == "low":
-            formatted += "ℹ️ "
-        
-        # Add notification type indicator
-        if notification_type == "health_alert":
-            formatted += "HEALTH: "
-        elif notification_type == "error_alert":
-            formatted += "ERROR: "
-        elif notification_type == "metrics_alert":
-            formatted += "METRICS: "
-        
-        # Add the main message
-        formatted += message
-        
+        # Build the message as parts joined once, instead of repeated
+        # str concatenation that reallocates at every step
+        parts = [
+            self._env_prefix,
+            self._PRIO_PREFIX.get(priority, ""),
+            self._TYPE_PREFIX.get(notification_type, ""),
+            message
+        ]
+
         # Add link if requested
         if include_link and link_url:
-            formatted += f"\n\nView details: {link_url}"
-        
+            parts.append(f"\n\nView details: {link_url}")
+
         # Add timestamp
-        formatted += f"\n\nTime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        return formatted
+        parts.append(f"\n\nTime: {datetime.now():%Y-%m-%d %H:%M:%S}")
+
+        return "".join(parts)
+
+    async def _dispatch(self, *sends) -> List[Any]:
+        """Run independent channel sends concurrently.
+
+        Latency becomes the slowest channel instead of the sum of all
+        three; failures are logged per channel without cancelling the
+        others.
+        """
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Notification channel send failed: {result}")
+        return results
+
+    def _build_alert_parts(
+        self,
+        slack_emoji: str,
+        plain_emoji: str,
+        title: str,
+        lines: List[tuple]
+    ) -> tuple:
+        """Build the Slack-markdown and plain-text alert bodies in one pass.
+
+        Each entry in ``lines`` is ``(label, value)`` for a field line,
+        ``(label, None)`` for a section header, or ``(None, text)`` for a
+        verbatim line. Both variants come straight from the same fields,
+        replacing the old build-Slack-then-strip ``.replace()`` passes.
+        """
+        slack_parts = [f"{slack_emoji} *{title}*\n"]
+        plain_parts = [f"{plain_emoji} {title}\n"]
+        for label, value in lines:
+            if label is None:
+                slack_parts.append(value)
+                plain_parts.append(value)
+            elif value is None:
+                slack_parts.append(f"\n*{label}*:")
+                plain_parts.append(f"\n{label}:")
+            else:
+                slack_parts.append(f"*{label}*: {value}")
+                plain_parts.append(f"{label}: {value}")
+        slack_parts.append(f"\nEnvironment: {self.environment}")
+        plain_parts.append(f"\nEnvironment: {self.environment}")
+        return "\n".join(slack_parts), "\n".join(plain_parts)
 
     async def notify_health_status(self, health_status: Dict[str, Any]) -> None:
         """Send notification about health status"""
         if health_status["status"] == "unhealthy":
-            message = "🚨 *Unhealthy Status Detected*\n\n"
-            for check, details in health_status["checks"].items():
-                if details["status"] == "unhealthy":
-                    message += f"*{check}*: {details['value']} (threshold: {details['threshold']})\n"
-            
-            message += f"\nEnvironment: {self.environment}"
-            
-            # Send to all channels based on preferences
-            await self.send_slack_notification(message, "error")
-            await self.send_email_notification(
-                "Unhealthy Status Detected",
-                message.replace("*", "").replace("🚨", "⚠️"),
-                self.admin_emails
+            lines = [
+                (check, f"{details['value']} (threshold: {details['threshold']})")
+                for check, details in health_status["checks"].items()
+                if details["status"] == "unhealthy"
+            ]
+            slack_message, plain_message = self._build_alert_parts(
+                "🚨", "⚠️", "Unhealthy Status Detected", lines
             )
+
+            # Send to all channels concurrently based on preferences
+            sends = [
+                self.send_slack_notification(slack_message, "error"),
+                self.send_email_notification(
+                    "Unhealthy Status Detected",
+                    plain_message,
+                    self.admin_emails
+                )
+            ]
             # Send SMS only for high severity issues
-            if any(check["severity"] == "high" for check in health_status["checks"].values()):
-                # Create a concise SMS message
-                sms_message = "Unhealthy: "
-                for check, details in health_status["checks"].items():
-                    if details["status"] == "unhealthy" and details["severity"] == "high":
-                        sms_message += f"{check}: {details['value']}, "
-                
-                await self.send_sms_notification(
-                    sms_message.rstrip(", "),
+            high_severity = [
+                f"{check}: {details['value']}"
+                for check, details in health_status["checks"].items()
+                if details["status"] == "unhealthy" and details["severity"] == "high"
+            ]
+            if high_severity:
+                sends.append(self.send_sms_notification(
+                    "Unhealthy: " + ", ".join(high_severity),
                     notification_type="health_alert",
                     priority="high",
                     include_link=True,
-                    link_url=f"{os.getenv('DASHBOARD_URL', 'http://localhost:8000')}/health"
-                )
+                    link_url=self._health_url
+                ))
+
+            await self._dispatch(*sends)
 
     async def notify_error(self, error: Exception, context: Dict[str, Any] = None) -> None:
         """Send notification about an error"""
-        message = f"❌ *Error Occurred*\n\n"
-        message += f"*Error Type*: {type(error).__name__}\n"
-        message += f"*Message*: {str(error)}\n"
-        
+        lines = [
+            ("Error Type", type(error).__name__),
+            ("Message", str(error)),
+        ]
         if context:
-            message += "\n*Context*:\n"
-            for key, value in context.items():
-                message += f"- {key}: {value}\n"
-        
-        message += f"\nEnvironment: {self.environment}"
-        
-        # Send to all channels based on preferences
-        await self.send_slack_notification(message, "error")
-        await self.send_email_notification(
-            f"Error: {type(error).__name__}",
-            message.replace("*", "").replace("❌", "⚠️"),
-            self.admin_emails
+            lines.append(("Context", None))
+            lines.extend((None, f"- {key}: {value}") for key, value in context.items())
+
+        slack_message, plain_message = self._build_alert_parts(
+            "❌", "⚠️", "Error Occurred", lines
         )
-        # Send SMS for errors
-        await self.send_sms_notification(
-            f"Error: {type(error).__name__} - {str(error)}",
-            notification_type="error_alert",
-            priority="high",
-            include_link=True,
-            link_url=f"{os.getenv('DASHBOARD_URL', 'http://localhost:8000')}/errors"
+
+        # Send to all channels concurrently based on preferences
+        await self._dispatch(
+            self.send_slack_notification(slack_message, "error"),
+            self.send_email_notification(
+                f"Error: {type(error).__name__}",
+                plain_message,
+                self.admin_emails
+            ),
+            self.send_sms_notification(
+                f"Error: {type(error).__name__} - {str(error)}",
+                notification_type="error_alert",
+                priority="high",
+                include_link=True,
+                link_url=self._errors_url
+            )
         )
 
     async def notify_metrics(self, metrics: Dict[str, Any]) -> None:
         """Send notification about current metrics"""
+        # Hoist the repeatedly-read fields once; this runs on every
+        # metrics tick, so the guard below can bail out before any
+        # message-building work happens
+        error_rate = metrics["error_rate"]
+        consecutive_errors = metrics["consecutive_errors"]
+        system_metrics = metrics.get("system_metrics") or {}
+        cpu_usage = system_metrics.get("current_cpu_usage_percent", 0)
+
         # Only send notifications if there are concerning metrics
-        if (metrics["error_rate"] > 0.1 or 
-            metrics["consecutive_errors"] > 0 or 
-            metrics["system_metrics"]["current_cpu_usage_percent"] > 80):
-            
-            message = "📊 *Metrics Update*\n\n"
-            message += f"*Total Requests*: {metrics['total_requests']}\n"
-            message += f"*Error Rate*: {metrics['error_rate']:.2%}\n"
-            message += f"*Avg Response Time*: {metrics['avg_response_time']:.2f}s\n"
-            message += f"*Uptime*: {metrics['uptime_seconds'] / 3600:.1f}h\n"
-            
-            if metrics.get('request_types'):
-                message += "\n*Request Types*:\n"
-                for req_type, count in metrics['request_types'].items():
-                    message += f"- {req_type}: {count}\n"
-            
-            if metrics.get('system_metrics'):
-                message += "\n*System Metrics*:\n"
-                message += f"- Memory Usage: {metrics['system_metrics']['current_memory_usage_mb']:.1f}MB\n"
-                message += f"- CPU Usage: {metrics['system_metrics']['current_cpu_usage_percent']:.1f}%\n"
-            
-            if metrics['consecutive_errors'] > 0:
-                message += f"\n*Consecutive Errors*: {metrics['consecutive_errors']}\n"
-            
-            message += f"\nEnvironment: {self.environment}"
-            
-            # Send to all channels based on preferences
-            await self.send_slack_notification(message, "info")
-            await self.send_email_notification(
+        if not (error_rate > 0.1 or consecutive_errors > 0 or cpu_usage > 80):
+            return
+
+        lines = [
+            ("Total Requests", metrics['total_requests']),
+            ("Error Rate", f"{error_rate:.2%}"),
+            ("Avg Response Time", f"{metrics['avg_response_time']:.2f}s"),
+            ("Uptime", f"{metrics['uptime_seconds'] / 3600:.1f}h"),
+        ]
+
+        if metrics.get('request_types'):
+            lines.append(("Request Types", None))
+            lines.extend(
+                (None, f"- {req_type}: {count}")
+                for req_type, count in metrics['request_types'].items()
+            )
+
+        if system_metrics:
+            lines.append(("System Metrics", None))
+            lines.append((None, f"- Memory Usage: {system_metrics['current_memory_usage_mb']:.1f}MB"))
+            lines.append((None, f"- CPU Usage: {cpu_usage:.1f}%"))
+
+        if consecutive_errors > 0:
+            lines.append(("Consecutive Errors", consecutive_errors))
+
+        slack_message, plain_message = self._build_alert_parts(
+            "📊", "📈", "Metrics Update", lines
+        )
+
+        # Determine priority based on metrics
+        priority = "normal"
+        if error_rate > 0.2 or consecutive_errors > 5:
+            priority = "high"
+        elif error_rate > 0.1 or cpu_usage > 80:
+            priority = "medium"
+
+        # Send to all channels concurrently based on preferences
+        await self._dispatch(
+            self.send_slack_notification(slack_message, "info"),
+            self.send_email_notification(
                 "Metrics Update",
-                message.replace("*", "").replace("📊", "📈"),
+                plain_message,
                 self.admin_emails
-            )
-            
-            # Determine priority based on metrics
-            priority = "normal"
-            if metrics["error_rate"] > 0.2 or metrics["consecutive_errors"] > 5:
-                priority = "high"
-            elif metrics["error_rate"] > 0.1 or metrics["system_metrics"]["current_cpu_usage_percent"] > 80:
-                priority = "medium"
-                
-            # Send SMS for concerning metrics
-            await self.send_sms_notification(
-                f"Metrics: Error {metrics['error_rate']:.1%}, CPU {metrics['system_metrics']['current_cpu_usage_percent']:.1f}%",
+            ),
+            self.send_sms_notification(
+                f"Metrics: Error {error_rate:.1%}, CPU {cpu_usage:.1f}%",
                 notification_type="metrics_alert",
                 priority=priority,
                 include_link=True,
-                link_url=f"{os.getenv('DASHBOARD_URL', 'http://localhost:8000')}/metrics"
+                link_url=self._metrics_url
             )
+        )
     
     async def check_metrics(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Check metrics and send notifications if thresholds are exceeded"""
         try:
             notifications = []
-            
-            # Calculate error rate
-            total_requests = 0
-            total_errors = 0
-            
-            for key, data in metrics.get("requests", {}).items():
-                total_requests += data.get("count", 0)
-            
-            for key, data in metrics.get("errors", {}).items():
-                total_errors += data.get("count", 0)
-            
+            # Accumulate alerts first, then dispatch one email and one
+            # Slack post instead of a send per triggered threshold
+            alerts = []
+
+            # Calculate error rate; sum() iterates in C instead of
+            # re-binding an accumulator per entry
+            total_requests = sum(data.get("count", 0) for data in metrics.get("requests", {}).values())
+            total_errors = sum(data.get("count", 0) for data in metrics.get("errors", {}).values())
+
             error_rate = total_errors / total_requests if total_requests > 0 else 0
-            
+
             # Check error rate threshold
             if error_rate > self.notification_thresholds["error_rate"]:
-                subject = "High Error Rate Alert"
-                message = (
-                    f"The error rate has exceeded the threshold of "
-                    f"{self.notification_thresholds['error_rate'] * 100}%.\n"
-                    f"Current error rate: {error_rate * 100:.2f}%\n"
-                    f"Total requests: {total_requests}\n"
-                    f"Total errors: {total_errors}"
-                )
-                
-                email_result = await self.send_email_notification(subject, message)
-                slack_result = await self.send_slack_notification(
-                    f"*High Error Rate Alert*\n"
-                    f"Error rate: {error_rate * 100:.2f}% (threshold: {self.notification_thresholds['error_rate'] * 100}%)\n"
-                    f"Total requests: {total_requests}\n"
-                    f"Total errors: {total_errors}"
-                )
-                
-                notifications.append({
-                    "type": "high_error_rate",
-                    "email": email_result,
-                    "slack": slack_result
+                alerts.append({
+                    "notification": {"type": "high_error_rate"},
+                    "subject": "High Error Rate Alert",
+                    "message": (
+                        f"The error rate has exceeded the threshold of "
+                        f"{self.notification_thresholds['error_rate'] * 100}%.\n"
+                        f"Current error rate: {error_rate * 100:.2f}%\n"
+                        f"Total requests: {total_requests}\n"
+                        f"Total errors: {total_errors}"
+                    ),
+                    "attachment": {
+                        "color": "danger",
+                        "title": "High Error Rate Alert",
+                        "text": (
+                            f"Error rate: {error_rate * 100:.2f}% (threshold: {self.notification_thresholds['error_rate'] * 100}%)\n"
+                            f"Total requests: {total_requests}\n"
+                            f"Total errors: {total_errors}"
+                        )
+                    }
                 })
-            
+
             # Check response time threshold
+            response_time_threshold = self.notification_thresholds["response_time"]
             for key, data in metrics.get("processing_times", {}).items():
                 avg_time = data.get("avg_time", 0)
-                
-                if avg_time > self.notification_thresholds["response_time"]:
-                    subject = "High Response Time Alert"
-                    message = (
-                        f"The average response time for {key} has exceeded the threshold of "
-                        f"{self.notification_thresholds['response_time']} seconds.\n"
-                        f"Current average time: {avg_time:.2f} seconds\n"
-                        f"Total requests: {data.get('count', 0)}"
-                    )
-                    
-                    email_result = await self.send_email_notification(subject, message)
-                    slack_result = await self.send_slack_notification(
-                        f"*High Response Time Alert*\n"
-                        f"Operation: {key}\n"
-                        f"Avg time: {avg_time:.2f}s (threshold: {self.notification_thresholds['response_time']}s)\n"
-                        f"Total requests: {data.get('count', 0)}"
-                    )
-                    
-                    notifications.append({
-                        "type": "high_response_time",
-                        "operation": key,
-                        "email": email_result,
-                        "slack": slack_result
+
+                if avg_time > response_time_threshold:
+                    count = data.get("count", 0)
+                    alerts.append({
+                        "notification": {"type": "high_response_time", "operation": key},
+                        "subject": "High Response Time Alert",
+                        "message": (
+                            f"The average response time for {key} has exceeded the threshold of "
+                            f"{response_time_threshold} seconds.\n"
+                            f"Current average time: {avg_time:.2f} seconds\n"
+                            f"Total requests: {count}"
+                        ),
+                        "attachment": {
+                            "color": "warning",
+                            "title": "High Response Time Alert",
+                            "text": (
+                                f"Operation: {key}\n"
+                                f"Avg time: {avg_time:.2f}s (threshold: {response_time_threshold}s)\n"
+                                f"Total requests: {count}"
+                            )
+                        }
                     })
-            
+
             # Check consecutive errors
             if self.consecutive_errors >= self.notification_thresholds["consecutive_errors"]:
-                subject = "Consecutive Errors Alert"
-                message = (
-                    f"The system has encountered {self.consecutive_errors} consecutive errors.\n"
-                    f"This may indicate a systemic issue that requires attention."
-                )
-                
-                email_result = await self.send_email_notification(subject, message)
-                slack_result = await self.send_slack_notification(
-                    f"*Consecutive Errors Alert*\n"
+                consecutive_message = (
                     f"The system has encountered {self.consecutive_errors} consecutive errors.\n"
                     f"This may indicate a systemic issue that requires attention."
                 )
-                
-                notifications.append({
-                    "type": "consecutive_errors",
-                    "email": email_result,
-                    "slack": slack_result
+                alerts.append({
+                    "notification": {"type": "consecutive_errors"},
+                    "subject": "Consecutive Errors Alert",
+                    "message": consecutive_message,
+                    "attachment": {
+                        "color": "danger",
+                        "title": "Consecutive Errors Alert",
+                        "text": consecutive_message
+                    }
                 })
-                
+
                 # Reset consecutive errors count after notification
                 self.consecutive_errors = 0
-            
+
+            if alerts:
+                if len(alerts) == 1:
+                    subject = alerts[0]["subject"]
+                else:
+                    subject = f"Metrics Check: {len(alerts)} Alerts"
+                body = "\n\n".join(
+                    f"{alert['subject']}\n{alert['message']}" for alert in alerts
+                )
+
+                email_result = await self.send_email_notification(subject, body)
+                slack_result = await self._post_slack_blocks(
+                    [alert["attachment"] for alert in alerts]
+                )
+
+                for alert in alerts:
+                    notification = alert["notification"]
+                    notification["email"] = email_result
+                    notification["slack"] = slack_result
+                    notifications.append(notification)
+
             return {
                 "status": "success",
                 "message": f"Checked metrics and sent {len(notifications)} notifications",
@@ -1,10 +1,129 @@
 from typing import Dict, Any, List, Optional
-import json
+import asyncio
+import re
+import textwrap
 import uuid
 from datetime import datetime
-from src.utils.database import SessionLocal, Customer, Order
+from operator import mul
+from sqlalchemy import insert, lambda_stmt, select, update
+from sqlalchemy.orm import joinedload
+from src.utils.database import AsyncSessionLocal, Customer, Order
 from src.crm.handler import CRMHandler
 from src.ai.handler import AIHandler
+# AI responses can run to kilobytes; the shared helper parses them with
+# orjson when it's available
+from src.utils._json import loads as _loads
+
+# Strips markdown code fences (``` or ```json) wherever they appear,
+# instead of slicing by index and breaking on malformed responses
+_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+
+
+# Shared AIHandler: constructing one per message repaid client setup
+# on every extraction
+_ai_handler: Optional[AIHandler] = None
+
+def _get_ai_handler() -> AIHandler:
+    global _ai_handler
+    if _ai_handler is None:
+        _ai_handler = AIHandler()
+    return _ai_handler
+
+
+class BatchingExtractor:
+    """Coalesces order-extraction requests into one AI call.
+
+    Messages arriving within the batching window are numbered into a
+    single prompt; the model returns a JSON array and each caller's
+    future resolves with its own element. AI APIs charge and queue per
+    request, so a busy channel pays one round-trip for up to
+    _BATCH_MAX messages instead of one each.
+    """
+
+    _BATCH_MAX = 8
+    _BATCH_WINDOW = 0.05  # seconds
+
+    # Dedented once at import: shipping each line's leading indentation
+    # to the model costs prompt tokens on every request
+    _BATCH_PROMPT = textwrap.dedent("""\
+        Extract order information from each numbered message below.
+        Return a JSON array with one object per message, in order. Each object
+        must have 'items' (list of products with product_id, quantity, and price)
+        and 'shipping_address' (dictionary with street, city, state, zip, country).
+        If shipping address is not provided, use default values.
+        If product details are unclear, use best guess based on context.
+
+        {messages}""")
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, message: str) -> Dict[str, Any]:
+        """Queue a message and wait for its extracted order data"""
+        loop = asyncio.get_running_loop()
+        # The queue and worker belong to one event loop. If the owning
+        # loop has been replaced (per-test loops, worker restarts), the
+        # old worker never resolves anything again even though its task
+        # isn't done() — start fresh on the current loop.
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((message, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._BATCH_WINDOW
+            while len(batch) < self._BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._process(batch)
+
+    async def _process(self, batch) -> None:
+        numbered = "\n".join(f"{i}. {message}" for i, (message, _) in enumerate(batch, 1))
+        try:
+            response = await _get_ai_handler().get_completion(
+                self._BATCH_PROMPT.format(messages=numbered)
+            )
+            parsed = _loads(_FENCE.sub("", response).strip())
+            if not isinstance(parsed, list) or len(parsed) != len(batch):
+                raise ValueError("Batch extraction returned an unexpected shape")
+            for (_, future), order_data in zip(batch, parsed):
+                if not future.done():
+                    future.set_result(order_data)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+_extractor = BatchingExtractor()
+
+
+def _cart_total(items: List[Dict[str, Any]]) -> int:
+    """Sum price × quantity across line items (amounts in cents).
+
+    sum(map(mul, ...)) keeps the multiply-accumulate loop in C, which
+    matters when bulk ingest paths pass carts with thousands of lines.
+    """
+    return sum(map(
+        mul,
+        (item.get("price", 0) for item in items),
+        (item.get("quantity", 1) for item in items),
+    ))
 
 class OrderHandler:
     def __init__(self):
@@ -13,212 +132,193 @@ class OrderHandler:
     async def create_order(self, customer_id: int, items: List[Dict[str, Any]], shipping_address: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new order in the database and CRM"""
         try:
-            db = SessionLocal()
-            
-            # Get customer
-            customer = db.query(Customer).filter(Customer.id == customer_id).first()
-            if not customer:
-                return {"status": "error", "message": "Customer not found"}
-            
-            # Generate order number
-            order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
-            
-            # Calculate total amount (in cents)
-            total_amount = sum(item.get("price", 0) * item.get("quantity", 1) for item in items)
-            
-            # Create order in database
-            order = Order(
-                customer_id=customer_id,
-                order_number=order_number,
-                status="pending",
-                items=items,
-                total_amount=total_amount,
-                shipping_address=shipping_address
-            )
-            
-            db.add(order)
-            db.commit()
-            db.refresh(order)
-            
-            # Create order in CRM
-            crm_result = await self.crm_handler.create_order(str(customer_id), {
-                "order_number": order_number,
-                "items": items,
-                "total_amount": total_amount,
-                "shipping_address": shipping_address
-            })
-            
-            if crm_result.get("status") == "error":
-                # Update order status to indicate CRM error
-                order.status = "crm_error"
-                db.commit()
-                return {"status": "error", "message": "Error creating order in CRM", "order_id": order.id}
-            
-            return {
-                "status": "success",
-                "order_id": order.id,
-                "order_number": order_number,
-                "total_amount": total_amount
-            }
-            
+            async with AsyncSessionLocal() as db:
+                # Only existence matters here; SELECT 1 skips fetching
+                # and hydrating the full Customer row
+                result = await db.execute(select(1).where(Customer.id == customer_id))
+                if result.scalar() is None:
+                    return {"status": "error", "message": "Customer not found"}
+
+                # Generate order number
+                order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+
+                # Calculate total amount (in cents)
+                total_amount = _cart_total(items)
+
+                # Create order in database; RETURNING hands back the
+                # generated id with the INSERT itself, dropping the
+                # refresh() SELECT round-trip
+                result = await db.execute(
+                    insert(Order)
+                    .values(
+                        customer_id=customer_id,
+                        order_number=order_number,
+                        status="pending",
+                        items=items,
+                        total_amount=total_amount,
+                        shipping_address=shipping_address
+                    )
+                    .returning(Order.id)
+                )
+                order_id = result.scalar_one()
+                await db.commit()
+
+                # Create order in CRM
+                crm_result = await self.crm_handler.create_order(str(customer_id), {
+                    "order_number": order_number,
+                    "items": items,
+                    "total_amount": total_amount,
+                    "shipping_address": shipping_address
+                })
+
+                if crm_result.get("status") == "error":
+                    # Update order status to indicate CRM error
+                    await db.execute(
+                        update(Order).where(Order.id == order_id).values(status="crm_error")
+                    )
+                    await db.commit()
+                    return {"status": "error", "message": "Error creating order in CRM", "order_id": order_id}
+
+                return {
+                    "status": "success",
+                    "order_id": order_id,
+                    "order_number": order_number,
+                    "total_amount": total_amount
+                }
+
         except Exception as e:
             return {"status": "error", "message": str(e)}
-        finally:
-            db.close()
 
     async def get_order(self, order_id: int) -> Dict[str, Any]:
         """Get order details from database"""
         try:
-            db = SessionLocal()
-            
-            # Get order
-            order = db.query(Order).filter(Order.id == order_id).first()
-            if not order:
-                return {"status": "error", "message": "Order not found"}
-            
-            # Get customer
-            customer = db.query(Customer).filter(Customer.id == order.customer_id).first()
-            
-            return {
-                "status": "success",
-                "order": {
-                    "id": order.id,
-                    "order_number": order.order_number,
-                    "status": order.status,
-                    "items": order.items,
-                    "total_amount": order.total_amount,
-                    "shipping_address": order.shipping_address,
-                    "created_at": order.created_at.isoformat(),
-                    "updated_at": order.updated_at.isoformat(),
-                    "customer": {
-                        "id": customer.id,
-                        "name": customer.name,
-                        "phone_number": customer.phone_number,
-                        "email": customer.email
-                    } if customer else None
+            async with AsyncSessionLocal() as db:
+                # Get order and customer in one round-trip via JOIN.
+                # lambda_stmt caches the compiled SQL, so repeat calls
+                # only swap in the new bind parameter
+                stmt = lambda_stmt(
+                    lambda: select(Order)
+                    .options(joinedload(Order.customer))
+                    .where(Order.id == order_id)
+                )
+                result = await db.execute(stmt)
+                order = result.scalar_one_or_none()
+                if not order:
+                    return {"status": "error", "message": "Order not found"}
+
+                customer = order.customer
+
+                return {
+                    "status": "success",
+                    "order": {
+                        "id": order.id,
+                        "order_number": order.order_number,
+                        "status": order.status,
+                        "items": order.items,
+                        "total_amount": order.total_amount,
+                        "shipping_address": order.shipping_address,
+                        "created_at": order.created_at.isoformat(),
+                        "updated_at": order.updated_at.isoformat(),
+                        "customer": {
+                            "id": customer.id,
+                            "name": customer.name,
+                            "phone_number": customer.phone_number,
+                            "email": customer.email
+                        } if customer else None
+                    }
                 }
-            }
-            
+
         except Exception as e:
             return {"status": "error", "message": str(e)}
-        finally:
-            db.close()
 
     async def update_order_status(self, order_id: int, status: str) -> Dict[str, Any]:
         """Update order status in database and CRM"""
         try:
-            db = SessionLocal()
-            
-            # Get order
-            order = db.query(Order).filter(Order.id == order_id).first()
-            if not order:
-                return {"status": "error", "message": "Order not found"}
-            
-            # Update status
-            order.status = status
-            db.commit()
-            
-            # Update status in CRM
-            crm_result = await self.crm_handler.update_order_status(order.order_number, status)
-            
-            if crm_result.get("status") == "error":
-                return {"status": "error", "message": "Error updating order status in CRM"}
-            
-            return {
-                "status": "success",
-                "order_id": order.id,
-                "order_number": order.order_number,
-                "status": order.status
-            }
-            
+            async with AsyncSessionLocal() as db:
+                # Only id and order_number are needed here; projecting them
+                # skips hydrating the JSON items/shipping_address columns
+                stmt = lambda_stmt(
+                    lambda: select(Order.id, Order.order_number).where(Order.id == order_id)
+                )
+                result = await db.execute(stmt)
+                row = result.first()
+                if not row:
+                    return {"status": "error", "message": "Order not found"}
+
+                # Update status without loading the full row
+                await db.execute(
+                    update(Order).where(Order.id == order_id).values(status=status)
+                )
+                await db.commit()
+
+                # Update status in CRM
+                crm_result = await self.crm_handler.update_order_status(row.order_number, status)
+
+                if crm_result.get("status") == "error":
+                    return {"status": "error", "message": "Error updating order status in CRM"}
+
+                return {
+                    "status": "success",
+                    "order_id": row.id,
+                    "order_number": row.order_number,
+                    "status": status
+                }
+
         except Exception as e:
             return {"status": "error", "message": str(e)}
-        finally:
-            db.close()
 
-    async def get_customer_orders(self, customer_id: int) -> Dict[str, Any]:
-        """Get all orders for a customer"""
+    async def get_customer_orders(self, customer_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Get orders for a customer, newest first, one page at a time"""
         try:
-            db = SessionLocal()
-            
-            # Get orders
-            orders = db.query(Order).filter(Order.customer_id == customer_id).order_by(Order.created_at.desc()).all()
-            
-            return {
-                "status": "success",
-                "orders": [
-                    {
-                        "id": order.id,
-                        "order_number": order.order_number,
-                        "status": order.status,
-                        "total_amount": order.total_amount,
-                        "created_at": order.created_at.isoformat()
-                    }
-                    for order in orders
-                ]
-            }
-            
+            async with AsyncSessionLocal() as db:
+                # Project only the fields the response uses — the JSON
+                # items/shipping_address columns never leave the server —
+                # and paginate instead of returning the full history
+                stmt = lambda_stmt(
+                    lambda: select(Order.id, Order.order_number, Order.status, Order.total_amount, Order.created_at)
+                    .where(Order.customer_id == customer_id)
+                    .order_by(Order.created_at.desc())
+                    .limit(limit)
+                    .offset(offset)
+                )
+                result = await db.execute(stmt)
+                orders = result.all()
+
+                return {
+                    "status": "success",
+                    "orders": [
+                        {
+                            "id": order.id,
+                            "order_number": order.order_number,
+                            "status": order.status,
+                            "total_amount": order.total_amount,
+                            "created_at": order.created_at.isoformat()
+                        }
+                        for order in orders
+                    ]
+                }
+
         except Exception as e:
             return {"status": "error", "message": str(e)}
-        finally:
-            db.close()
 
     async def extract_order_from_message(self, message: str) -> Dict[str, Any]:
         """Extract order information from a message using AI"""
         try:
-            # Use AI handler to extract order details
-            ai_handler = AIHandler()
-            
-            # Create a prompt for the AI
-            prompt = f"""
-            Extract order information from the following message. 
-            Return a JSON object with 'items' (list of products with product_id, quantity, and price) 
-            and 'shipping_address' (dictionary with street, city, state, zip, country).
-            If shipping address is not provided, use default values.
-            If product details are unclear, use best guess based on context.
-            
-            Message: {message}
-            """
-            
-            # Get AI response
-            response = await ai_handler.get_completion(prompt)
-            
-            # Parse the response
-            try:
-                # Extract JSON from response
-                json_str = response.strip()
-                if json_str.startswith("```json"):
-                    json_str = json_str[7:-3]  # Remove ```json and ``` markers
-                
-                order_data = json.loads(json_str)
-                
-                # Validate the structure
-                if "items" not in order_data or "shipping_address" not in order_data:
-                    raise ValueError("Missing required fields in AI response")
-                
-                # Ensure shipping address has all required fields
-                required_address_fields = ["street", "city", "state", "zip", "country"]
-                for field in required_address_fields:
-                    if field not in order_data["shipping_address"]:
-                        order_data["shipping_address"][field] = "Not provided"
-                
-                return order_data
-                
-            except json.JSONDecodeError:
-                # If AI response is not valid JSON, use a default structure
-                return {
-                    "items": [
-                        {"product_id": 1, "quantity": 1, "price": 1000}  # $10.00
-                    ],
-                    "shipping_address": {
-                        "street": "Not provided",
-                        "city": "Not provided",
-                        "state": "Not provided",
-                        "zip": "Not provided",
-                        "country": "Not provided"
-                    }
-                }
-                
+            # Requests arriving close together share one AI round-trip
+            order_data = await _extractor.submit(message)
+
+            # Validate the structure
+            if not isinstance(order_data, dict) or "items" not in order_data or "shipping_address" not in order_data:
+                raise ValueError("Missing required fields in AI response")
+
+            # Ensure shipping address has all required fields
+            required_address_fields = ["street", "city", "state", "zip", "country"]
+            for field in required_address_fields:
+                if field not in order_data["shipping_address"]:
+                    order_data["shipping_address"][field] = "Not provided"
+
+            return order_data
+
         except Exception as e:
             # Log the error and return a default structure
             print(f"Error extracting order from message: {str(e)}")
@@ -233,4 +333,4 @@ class OrderHandler:
                     "zip": "Not provided",
                     "country": "Not provided"
                 }
-            } 
\ No newline at end of file
+            }
\ No newline at end of file
@@ -1,29 +1,166 @@
+import asyncio
 import bcrypt
-import re
+import hashlib
 import logging
-from typing import Tuple, Optional, List
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Optional, List
 from datetime import datetime, timedelta
 from src.config.security import security_settings
 from src.services.redis_service import redis_client
 import zxcvbn  # For password strength estimation
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 
 logger = logging.getLogger(__name__)
 
+# argon2id replaces bcrypt for new hashes: better memory-hardness per
+# millisecond of wall time, so verify-heavy endpoints spend less CPU at
+# the same security margin. Legacy bcrypt hashes still verify below and
+# migrate lazily via needs_rehash.
+_PH = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
+# Both KDFs release the GIL, so hashes and history comparisons can
+# genuinely run in parallel on this pool
+_KDF_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def _verify_hash(password: str, hashed: str) -> bool:
+    """True if password matches an argon2 or legacy bcrypt hash"""
+    if hashed.startswith("$argon2"):
+        try:
+            return _PH.verify(hashed, password)
+        except VerifyMismatchError:
+            return False
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        return False
+
+# History checks re-verify the same candidate password against the same
+# stored hashes (retried password changes, multi-field forms), and each
+# verification costs tens of ms of KDF work. Results are cached for a
+# short TTL keyed by (blake2 digest of the password, stored hash) — the
+# plaintext never enters the cache, mirroring _ZXCVBN_CACHE below. The
+# login path stays uncached: lockout accounting must see every attempt.
+_VERIFY_CACHE: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+_VERIFY_CACHE_TTL = 300.0  # seconds
+_VERIFY_CACHE_MAX = 2048
+
+def _verify_hash_cached(password: str, hashed: str) -> bool:
+    """_verify_hash with a short-lived digest-keyed result cache"""
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16).hexdigest()
+    key = (digest, hashed)
+    entry = _VERIFY_CACHE.get(key)
+    now = time.monotonic()
+    if entry is not None and now < entry[0]:
+        return entry[1]
+    result = _verify_hash(password, hashed)
+    if len(_VERIFY_CACHE) >= _VERIFY_CACHE_MAX:
+        _VERIFY_CACHE.clear()
+    _VERIFY_CACHE[key] = (now + _VERIFY_CACHE_TTL, result)
+    return result
+
+# Server-side scripts collapse the lockout bookkeeping into one Redis
+# round-trip each: the old paths paid up to three RTTs (GET/TTL/DEL and
+# INCR/EXPIRE) per login attempt
+_LUA_IS_LOCKED = """
+local n = redis.call('GET', KEYS[1])
+if not n or tonumber(n) < tonumber(ARGV[1]) then
+    return 0
+end
+if redis.call('TTL', KEYS[1]) > 0 then
+    return 1
+end
+redis.call('DEL', KEYS[1])
+return 0
+"""
+
+_LUA_RECORD_ATTEMPT = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+elseif n >= tonumber(ARGV[2]) then
+    local t = math.min(tonumber(ARGV[3]) * 2 ^ (n - tonumber(ARGV[2])), 86400)
+    redis.call('EXPIRE', KEYS[1], math.floor(t))
+end
+return n
+"""
+
+# zxcvbn costs tens of ms per estimate and is deterministic, so repeat
+# evaluations of the same password (retried signups, history checks) are
+# served from this digest-keyed cache. Only the slim summary is stored —
+# never the password itself — and entries are keyed by a blake2 digest.
+_ZXCVBN_CACHE: Dict[str, Tuple[int, bool, Tuple[str, ...]]] = {}
+_ZXCVBN_CACHE_MAX = 1024
+
+def _zxcvbn_summary(password: str, user_inputs: list) -> Tuple[int, bool, Tuple[str, ...]]:
+    """Return (score, has_sequence, suggestions), cached when possible"""
+    if user_inputs:
+        # Results depend on the user context; don't cache these
+        result = zxcvbn.zxcvbn(password, user_inputs=user_inputs)
+        return (
+            result['score'],
+            bool(result['sequence']),
+            tuple(result.get('feedback', {}).get('suggestions', []))
+        )
+
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16).hexdigest()
+    summary = _ZXCVBN_CACHE.get(digest)
+    if summary is None:
+        result = zxcvbn.zxcvbn(password)
+        summary = (
+            result['score'],
+            bool(result['sequence']),
+            tuple(result.get('feedback', {}).get('suggestions', []))
+        )
+        if len(_ZXCVBN_CACHE) >= _ZXCVBN_CACHE_MAX:
+            _ZXCVBN_CACHE.clear()
+        _ZXCVBN_CACHE[digest] = summary
+    return summary
+
+# Character-class lookup table: one pass over the password bytes ORs
+# together a 4-bit mask of the classes seen, replacing four regex scans
+_CLASS_UPPER, _CLASS_LOWER, _CLASS_DIGIT, _CLASS_SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _CLASS_UPPER | _CLASS_LOWER | _CLASS_DIGIT | _CLASS_SPECIAL
+
+_CLASS_LUT = [0] * 256
+for _b in range(ord('A'), ord('Z') + 1):
+    _CLASS_LUT[_b] = _CLASS_UPPER
+for _b in range(ord('a'), ord('z') + 1):
+    _CLASS_LUT[_b] = _CLASS_LOWER
+for _b in range(ord('0'), ord('9') + 1):
+    _CLASS_LUT[_b] = _CLASS_DIGIT
+for _b in b'!@#$%^&*(),.?":{}|<>':
+    _CLASS_LUT[_b] = _CLASS_SPECIAL
+del _b
+
 class PasswordService:
     def __init__(self):
-        self.bcrypt_rounds = 12  # Recommended rounds for security/performance balance
         self.max_login_attempts = security_settings.PASSWORD_MAX_ATTEMPTS
         self.lockout_duration = security_settings.PASSWORD_LOCKOUT_DURATION
         self.password_history_size = security_settings.PASSWORD_HISTORY_SIZE
         
     async def hash_password(self, password: str) -> str:
-        """Hash password with bcrypt using optimal work factor"""
+        """Hash password with argon2id using tuned parameters"""
         try:
-            salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
-            return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+            # The KDF still blocks for tens of ms; run it on the pool so
+            # the event loop keeps serving other requests
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_KDF_POOL, _PH.hash, password)
         except Exception as e:
             logger.error(f"Error hashing password: {str(e)}")
             raise
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if a stored hash should be upgraded after a successful login.
+
+        Covers both legacy bcrypt hashes and argon2 hashes made with
+        older parameters; callers rehash and update the stored row.
+        """
+        if not hashed_password.startswith("$argon2"):
+            return True
+        return _PH.check_needs_rehash(hashed_password)
         
     async def verify_password(self, password: str, hashed_password: str, user_id: str) -> bool:
         """Verify password with rate limiting and account lockout"""
@@ -36,10 +173,11 @@ class PasswordService:
                     detail="Account is locked. Please try again later or reset your password."
                 )
                 
-            # Verify password
-            is_valid = bcrypt.checkpw(
-                password.encode('utf-8'),
-                hashed_password.encode('utf-8')
+            # Verify password off the event loop (see hash_password);
+            # _verify_hash accepts argon2 and legacy bcrypt hashes
+            loop = asyncio.get_running_loop()
+            is_valid = await loop.run_in_executor(
+                _KDF_POOL, _verify_hash, password, hashed_password
             )
             
             if not is_valid:
@@ -61,7 +199,18 @@ class PasswordService:
             # Basic length check
             if len(password) < security_settings.PASSWORD_MIN_LENGTH:
                 return False, f"Password must be at least {security_settings.PASSWORD_MIN_LENGTH} characters"
-                
+
+            # Complexity requirements next: the single-scan class mask is
+            # orders of magnitude cheaper than zxcvbn, so passwords that
+            # fail it never pay for the full strength estimation
+            mask = 0
+            for byte in password.encode('utf-8'):
+                mask |= _CLASS_LUT[byte]
+                if mask == _ALL_CLASSES:
+                    break
+            if mask != _ALL_CLASSES:
+                return False, "Password must contain uppercase, lowercase, numbers, and special characters"
+
             # Use zxcvbn for comprehensive password strength check
             user_inputs = []
             if user_info:
@@ -71,27 +220,17 @@ class PasswordService:
                     user_info.get('first_name', ''),
                     user_info.get('last_name', '')
                 ])
-                
-            strength_result = zxcvbn.zxcvbn(password, user_inputs=user_inputs)
-            
+
+            score, has_sequence, suggestions = _zxcvbn_summary(password, user_inputs)
+
             # Check password strength score (0-4)
-            if strength_result['score'] < 3:
-                suggestions = strength_result.get('feedback', {}).get('suggestions', [])
+            if score < 3:
                 return False, f"Password is too weak. {' '.join(suggestions)}"
-                
+
             # Check for common patterns
-            if strength_result['sequence']:
+            if has_sequence:
                 return False, "Password contains common patterns or sequences"
-                
-            # Additional complexity requirements
-            if not all([
-                re.search(r'[A-Z]', password),  # uppercase
-                re.search(r'[a-z]', password),  # lowercase
-                re.search(r'[0-9]', password),  # numbers
-                re.search(r'[!@#$%^&*(),.?":{}|<>]', password)  # special chars
-            ]):
-                return False, "Password must contain uppercase, lowercase, numbers, and special characters"
-                
+
             return True, None
             
         except Exception as e:
@@ -101,20 +240,16 @@ class PasswordService:
     async def is_account_locked(self, user_id: str) -> bool:
         """Check if account is locked due to failed attempts"""
         try:
-            attempts_key = f"login_attempts:{user_id}"
-            attempts = await redis_client.get(attempts_key)
-            
-            if attempts and int(attempts) >= self.max_login_attempts:
-                # Check if lockout period has expired
-                ttl = await redis_client.ttl(attempts_key)
-                if ttl > 0:
-                    return True
-                    
-                # If lockout period expired, reset attempts
-                await self.reset_failed_attempts(user_id)
-                
-            return False
-            
+            # One round-trip: the script checks the count and TTL and
+            # resets an expired lockout server-side
+            locked = await redis_client.eval(
+                _LUA_IS_LOCKED,
+                1,
+                f"login_attempts:{user_id}",
+                self.max_login_attempts
+            )
+            return bool(locked)
+
         except Exception as e:
             logger.error(f"Error checking account lock: {str(e)}")
             return False
@@ -122,17 +257,18 @@ class PasswordService:
     async def record_failed_attempt(self, user_id: str):
         """Record failed login attempt with exponential backoff"""
         try:
-            key = f"login_attempts:{user_id}"
-            attempts = await redis_client.incr(key)
-            
-            if attempts == 1:
-                # First failure: set initial lockout time
-                await redis_client.expire(key, 300)  # 5 minutes
-            elif attempts >= self.max_login_attempts:
-                # Subsequent failures: increase lockout time exponentially
-                lockout_time = min(self.lockout_duration * (2 ** (attempts - self.max_login_attempts)), 86400)  # Max 24 hours
-                await redis_client.expire(key, lockout_time)
-                
+            # INCR plus the exponential-backoff EXPIRE run as one script:
+            # initial window 5 minutes, then doubling per failure past
+            # the limit, capped at 24 hours
+            attempts = await redis_client.eval(
+                _LUA_RECORD_ATTEMPT,
+                1,
+                f"login_attempts:{user_id}",
+                300,
+                self.max_login_attempts,
+                self.lockout_duration
+            )
+
             logger.warning(f"Failed login attempt {attempts} for user {user_id}")
             
         except Exception as e:
@@ -164,12 +300,25 @@ class PasswordService:
         try:
             key = f"password_history:{user_id}"
             history = await redis_client.lrange(key, 0, -1)
-            
-            for old_hash in history:
-                if bcrypt.checkpw(password.encode('utf-8'), old_hash.encode('utf-8')):
-                    logger.warning(f"Password reuse detected for user {user_id}")
-                    return True
-                    
+
+            if not history:
+                return False
+
+            # Compare against every history entry concurrently; each
+            # KDF verification costs real CPU time, so running them
+            # serially made password changes take seconds. The cached
+            # variant also skips the KDF entirely when the same
+            # candidate was checked against a hash recently
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(_KDF_POOL, _verify_hash_cached, password, old_hash)
+                for old_hash in history
+            ])
+
+            if any(results):
+                logger.warning(f"Password reuse detected for user {user_id}")
+                return True
+
             return False
             
         except Exception as e:
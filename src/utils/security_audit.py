@@ -1,11 +1,28 @@
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-from src.utils.database import Base
+from src.utils.database import Base, SessionLocal
 from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
 from src.utils.logger import logger
-from src.models.audit_log import AuditLog
+
+__all__ = [
+    "SecurityAuditLog",
+    "setup_security_logging",
+    "shutdown_security_logging",
+    "flush_security_events",
+    "log_security_event",
+    "log_failed_login",
+    "log_api_access",
+    "log_login_attempt",
+    "log_password_change",
+    "get_audit_logs",
+]
 
 # Security audit model
 class SecurityAuditLog(Base):
@@ -17,59 +34,158 @@ class SecurityAuditLog(Base):
     user_id = Column(String, nullable=True)
     ip_address = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
-    details = Column(JSON, nullable=True)
+    # JSONB on Postgres: stored decomposed, so reads skip re-parsing the
+    # text and containment queries can use the GIN index; plain JSON
+    # elsewhere (the dev SQLite database)
+    details = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     success = Column(Boolean, nullable=False, default=True)
 
+# Security events also go to a dedicated logger whose handler only
+# enqueues the record; a background listener thread does the formatting
+# and rotating-file I/O, keeping both off the request path
+_security_log_queue: "queue.Queue" = queue.Queue(-1)
+security_logger = logging.getLogger("security")
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_security_logging(log_path: str = "security_audit.log") -> None:
+    """Start the background security-log listener (call at app boot)"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    security_logger.addHandler(logging.handlers.QueueHandler(_security_log_queue))
+    security_logger.setLevel(logging.INFO)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=50_000_000, backupCount=10
+    )
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    )
+    _log_listener = logging.handlers.QueueListener(_security_log_queue, file_handler)
+    _log_listener.start()
+
+def shutdown_security_logging() -> None:
+    """Drain and stop the security-log listener (call at shutdown)"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    _flush_stop.set()
+    flush_security_events()
+
+# Write coalescing: events buffer in memory and flush as one
+# bulk INSERT per batch, amortizing the commit/fsync across many rows.
+# Bursts get batched; a background flusher thread empties the buffer
+# every interval so a quiet system never leaves events stranded in
+# memory waiting for the next one to arrive.
+_AUDIT_BUFFER: List[dict] = []
+_AUDIT_LOCK = threading.Lock()
+_AUDIT_FLUSH_MAX_ROWS = 500
+_AUDIT_FLUSH_INTERVAL = 0.1  # seconds
+_last_flush = time.monotonic()
+_flush_thread: Optional[threading.Thread] = None
+_flush_stop = threading.Event()
+
+def _flush_loop() -> None:
+    while not _flush_stop.wait(_AUDIT_FLUSH_INTERVAL):
+        flush_security_events()
+
+def _ensure_flusher() -> None:
+    global _flush_thread
+    if _flush_thread is None or not _flush_thread.is_alive():
+        _flush_thread = threading.Thread(
+            target=_flush_loop, name="security-audit-flusher", daemon=True
+        )
+        _flush_thread.start()
+
+def _flush_batch(batch: List[dict]) -> None:
+    try:
+        with SessionLocal() as session:
+            session.bulk_insert_mappings(SecurityAuditLog, batch)
+            session.commit()
+    except Exception as e:
+        logger.error(f"Failed to flush {len(batch)} security events: {str(e)}")
+
+def flush_security_events() -> None:
+    """Write out any buffered security events"""
+    global _last_flush
+    with _AUDIT_LOCK:
+        batch = _AUDIT_BUFFER[:]
+        _AUDIT_BUFFER.clear()
+        _last_flush = time.monotonic()
+    if batch:
+        _flush_batch(batch)
+
 def log_security_event(
     db: Session,
     event_type: str,
-    user_id: Optional[str],
-    ip_address: str,
-    details: dict
+    *,
+    user_id: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    details: Optional[dict] = None,
+    success: bool = True
 ):
-    try:
-        audit_log = AuditLog(
-            event_type=event_type,
-            user_id=user_id,
-            ip_address=ip_address,
-            event_details=details,
-            timestamp=datetime.utcnow()
-        )
-        db.add(audit_log)
-        db.commit()
-    except Exception as e:
-        logger.error(f"Failed to log security event: {str(e)}")
-        db.rollback()
+    # db is kept for caller compatibility; writes go through the shared
+    # batching buffer rather than one INSERT+commit per event
+    global _last_flush
+    row = {
+        "event_type": event_type,
+        "user_id": user_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "details": details,
+        "success": success,
+        "timestamp": datetime.utcnow(),
+    }
+    # %s-style args defer formatting to the listener thread (and skip it
+    # entirely when the record is filtered)
+    security_logger.info(
+        "Security event: %s | User: %s | IP: %s", event_type, user_id, ip_address
+    )
+
+    _ensure_flusher()
+    with _AUDIT_LOCK:
+        _AUDIT_BUFFER.append(row)
+        now = time.monotonic()
+        if len(_AUDIT_BUFFER) < _AUDIT_FLUSH_MAX_ROWS and now - _last_flush < _AUDIT_FLUSH_INTERVAL:
+            # the background flusher picks this up within the interval
+            return
+        batch = _AUDIT_BUFFER[:]
+        _AUDIT_BUFFER.clear()
+        _last_flush = now
+    _flush_batch(batch)
 
 def log_failed_login(db: Session, username: str, ip_address: str, reason: str):
     log_security_event(
-        db=db,
-        event_type="failed_login",
+        db,
+        "failed_login",
         user_id=username,
         ip_address=ip_address,
-        details={"reason": reason}
+        details={"reason": reason},
+        success=False
     )
 
 def log_api_access(
     db: Session,
-    request_path: str,
+    endpoint: str,
     method: str,
     ip_address: str,
-    user_id: Optional[str],
-    status_code: int,
-    processing_time: float
+    user_agent: Optional[str] = None,
+    user_id: Optional[str] = None,
+    success: bool = True,
+    error: Optional[str] = None
 ):
+    details = {"endpoint": endpoint, "method": method}
+    if error:
+        details["error"] = error
     log_security_event(
-        db=db,
-        event_type="api_access",
+        db,
+        "api_access",
         user_id=user_id,
         ip_address=ip_address,
-        details={
-            "path": request_path,
-            "method": method,
-            "status_code": status_code,
-            "processing_time_ms": processing_time
-        }
+        user_agent=user_agent,
+        details=details,
+        success=success
     )
 
 def log_login_attempt(
@@ -83,11 +199,13 @@ def log_login_attempt(
     """Log a login attempt"""
     details = {"failure_reason": failure_reason} if not success else None
     log_security_event(
-        db=db,
-        event_type="login_attempt",
+        db,
+        "login_attempt",
         user_id=user_id,
         ip_address=ip_address,
-        details=details
+        user_agent=user_agent,
+        details=details,
+        success=success
     )
 
 def log_password_change(
@@ -101,9 +219,30 @@ def log_password_change(
     """Log a password change attempt"""
     details = {"failure_reason": failure_reason} if not success else None
     log_security_event(
-        db=db,
-        event_type="password_change",
+        db,
+        "password_change",
         user_id=user_id,
         ip_address=ip_address,
-        details=details
-    ) 
\ No newline at end of file
+        user_agent=user_agent,
+        details=details,
+        success=success
+    )
+
+async def get_audit_logs(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    limit: int = 100
+) -> List[SecurityAuditLog]:
+    """Query recorded audit events, newest first"""
+    # Surface anything still sitting in the buffer before reading
+    flush_security_events()
+    with SessionLocal() as session:
+        query = session.query(SecurityAuditLog)
+        if start_time is not None:
+            query = query.filter(SecurityAuditLog.timestamp >= start_time)
+        if end_time is not None:
+            query = query.filter(SecurityAuditLog.timestamp <= end_time)
+        if event_type is not None:
+            query = query.filter(SecurityAuditLog.event_type == event_type)
+        return query.order_by(SecurityAuditLog.timestamp.desc()).limit(limit).all()
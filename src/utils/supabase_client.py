@@ -1,4 +1,5 @@
 import os
+import threading
 from typing import Optional
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -8,31 +9,63 @@ load_dotenv()
 
 class SupabaseClient:
     _instance: Optional[Client] = None
-    
+    _lock = threading.Lock()
+
     @classmethod
     def get_client(cls) -> Client:
         """
         Get or create a Supabase client instance.
         Uses GitHub authentication if available.
+
+        Creation is deferred to first use (module import no longer pays
+        for client setup and the GitHub sign-in round-trip) and guarded
+        by double-checked locking so concurrent first callers share one
+        instance.
         """
         if cls._instance is None:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_API_KEY")
-            
-            if not url or not key:
-                raise ValueError("Missing Supabase credentials in .env file")
-            
-            cls._instance = create_client(url, key)
-            
-            # If GitHub token is available, sign in with GitHub
-            github_token = os.getenv("GITHUB_TOKEN")
-            if github_token:
-                try:
-                    cls._instance.auth.sign_in_with_github(github_token)
-                except Exception as e:
-                    print(f"Warning: Failed to authenticate with GitHub: {e}")
-        
+            with cls._lock:
+                if cls._instance is None:
+                    url = os.getenv("SUPABASE_URL")
+                    key = os.getenv("SUPABASE_API_KEY")
+
+                    if not url or not key:
+                        raise ValueError("Missing Supabase credentials in .env file")
+
+                    instance = create_client(url, key)
+
+                    # If GitHub token is available, sign in with GitHub
+                    github_token = os.getenv("GITHUB_TOKEN")
+                    if github_token:
+                        try:
+                            instance.auth.sign_in_with_github(github_token)
+                        except Exception as e:
+                            print(f"Warning: Failed to authenticate with GitHub: {e}")
+
+                    cls._instance = instance
+
         return cls._instance
 
-# Create a singleton instance
-supabase = SupabaseClient.get_client() 
\ No newline at end of file
+def get_supabase() -> Client:
+    """Return the shared Supabase client, creating it on first use"""
+    return SupabaseClient.get_client()
+
+# Forked workers (gunicorn) must not share the parent's client: its
+# httpx connection pool and auth state don't survive the fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        after_in_child=lambda: setattr(SupabaseClient, "_instance", None)
+    )
+
+class _LazySupabase:
+    """Module-level handle that defers client creation to first attribute access.
+
+    Keeps `from src.utils.supabase_client import supabase` working for
+    existing callers without re-introducing import-time I/O.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(SupabaseClient.get_client(), name)
+
+supabase = _LazySupabase()
@@ -1,17 +1,107 @@
-from typing import Dict, Any, Optional, List
-import aiohttp
+from typing import Dict, Any, Optional, List, Tuple
+import base64
+import functools
+import hashlib
+import hmac
+import httpx
 import logging
+import time
+from collections import OrderedDict
 from src.config.external_services import external_service_settings
 
 logger = logging.getLogger(__name__)
 
+def _twilio_call(fn):
+    """Log-and-reraise wrapper shared by the API methods.
+
+    Keeps the per-method bodies to the happy path instead of each one
+    carrying its own try/except with a hand-written log line.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error in {fn.__name__}: {str(e)}")
+            raise
+    return wrapper
+
 class TwilioClient:
     """Client for Twilio APIs"""
-    
+
+    # Once a message or call reaches one of these, Twilio never changes
+    # it again, so the cached response can be served forever
+    _TERMINAL_MESSAGE_STATUSES = frozenset({"delivered", "failed", "undelivered"})
+    _TERMINAL_CALL_STATUSES = frozenset({"completed", "failed", "busy", "no-answer", "canceled"})
+    _STATUS_TTL = 2.0  # seconds; bounds staleness for in-flight statuses
+    _STATUS_CACHE_MAX = 4096  # entries; oldest are evicted LRU-style
+
     def __init__(self):
         self.settings = external_service_settings.get_twilio_settings()
         self.base_url = "https://api.twilio.com/2010-04-01"
-        
+        # The account SID never changes after construction, so build the
+        # endpoint URLs and auth once instead of per request
+        sid = self.settings["account_sid"]
+        self._account_url = f"{self.base_url}/Accounts/{sid}"
+        self._messages_url = f"{self._account_url}/Messages.json"
+        self._calls_url = f"{self._account_url}/Calls.json"
+        self._auth = httpx.BasicAuth(sid, self.settings["auth_token"])
+        # One client for the object's lifetime: every call shares the
+        # connection pool instead of paying TCP + TLS setup to
+        # api.twilio.com per request
+        self._client: Optional[httpx.AsyncClient] = None
+        # SID -> (expiry, payload); dashboards poll the same SIDs, and a
+        # dict hit beats an HTTPS round-trip by orders of magnitude.
+        # Ordered so the least recently used SIDs can be evicted once
+        # the cache reaches _STATUS_CACHE_MAX
+        self._status_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _cached_status(self, sid: str) -> Optional[Dict[str, Any]]:
+        """Return a cached status payload if still valid"""
+        entry = self._status_cache.get(sid)
+        if entry is None:
+            return None
+        expires, payload = entry
+        if expires == 0.0 or time.monotonic() < expires:
+            self._status_cache.move_to_end(sid)
+            return payload
+        # Expired entries are dropped on read rather than left to pile up
+        del self._status_cache[sid]
+        return None
+
+    def _store_status(self, sid: str, payload: Dict[str, Any], terminal: bool) -> None:
+        """Cache a status payload; terminal ones are pinned, others expire"""
+        expires = 0.0 if terminal else time.monotonic() + self._STATUS_TTL
+        self._status_cache[sid] = (expires, payload)
+        self._status_cache.move_to_end(sid)
+        while len(self._status_cache) > self._STATUS_CACHE_MAX:
+            self._status_cache.popitem(last=False)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            # HTTP/2 multiplexes concurrent requests over one TCP+TLS
+            # connection, so burst fan-out doesn't queue behind
+            # head-of-line blocking the way keep-alive HTTP/1.1 does
+            self._client = httpx.AsyncClient(
+                http2=True,
+                auth=self._auth,
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=30,
+                    keepalive_expiry=75.0
+                )
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (call at app shutdown)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    @_twilio_call
     async def send_sms(
         self,
         to: str,
@@ -19,86 +109,69 @@ class TwilioClient:
         from_: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send SMS message"""
-        if not this.settings["sms_enabled"]:
+        if not self.settings["sms_enabled"]:
             raise ValueError("SMS messaging is disabled")
+
+        response = await self._get_client().post(
+            self._messages_url,
+            data={
+                "To": to,
+                "From": from_ or self.settings["phone_number"],
+                "Body": body
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        return {
+            "message_sid": result["sid"],
+            "status": result["status"],
+            "to": result["to"],
+            "from": result["from"],
+            "body": result["body"],
+            "date_created": result["date_created"]
+        }
             
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{this.base_url}/Accounts/{this.settings['account_sid']}/Messages.json",
-                    auth=aiohttp.BasicAuth(
-                        this.settings["account_sid"],
-                        this.settings["auth_token"]
-                    ),
-                    data={
-                        "To": to,
-                        "From": from_ or this.settings["phone_number"],
-                        "Body": body
-                    }
-                ) as response:
-                    result = await response.json()
-                    if response.status != 201:
-                        raise ValueError(f"SMS sending failed: {result.get('message')}")
-                        
-                    return {
-                        "message_sid": result["sid"],
-                        "status": result["status"],
-                        "to": result["to"],
-                        "from": result["from"],
-                        "body": result["body"],
-                        "date_created": result["date_created"]
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error sending SMS: {str(e)}")
-            raise
-            
+    @_twilio_call
     async def send_whatsapp(
         self,
         to: str,
         body: str,
-        media_url: Optional[str] = None
+        media_url: Optional[str] = None,
+        extra_fields: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Send WhatsApp message"""
-        if not this.settings["whatsapp_enabled"]:
+        if not self.settings["whatsapp_enabled"]:
             raise ValueError("WhatsApp messaging is disabled")
+
+        data = {
+            "To": f"whatsapp:{to}",
+            "From": f"whatsapp:{self.settings['whatsapp_number']}",
+            "Body": body
+        }
+
+        if media_url:
+            data["MediaUrl"] = media_url
+
+        # Callers can pass extra Messages API form fields, e.g.
+        # PersistentAction for location pins
+        if extra_fields:
+            data.update(extra_fields)
+
+        response = await self._get_client().post(self._messages_url, data=data)
+        response.raise_for_status()
+        result = response.json()
+
+        return {
+            "message_sid": result["sid"],
+            "status": result["status"],
+            "to": result["to"],
+            "from": result["from"],
+            "body": result["body"],
+            "date_created": result["date_created"]
+        }
             
-        try:
-            data = {
-                "To": f"whatsapp:{to}",
-                "From": f"whatsapp:{this.settings['whatsapp_number']}",
-                "Body": body
-            }
-            
-            if media_url:
-                data["MediaUrl"] = media_url
-                
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{this.base_url}/Accounts/{this.settings['account_sid']}/Messages.json",
-                    auth=aiohttp.BasicAuth(
-                        this.settings["account_sid"],
-                        this.settings["auth_token"]
-                    ),
-                    data=data
-                ) as response:
-                    result = await response.json()
-                    if response.status != 201:
-                        raise ValueError(f"WhatsApp message sending failed: {result.get('message')}")
-                        
-                    return {
-                        "message_sid": result["sid"],
-                        "status": result["status"],
-                        "to": result["to"],
-                        "from": result["from"],
-                        "body": result["body"],
-                        "date_created": result["date_created"]
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error sending WhatsApp message: {str(e)}")
-            raise
-            
+    @_twilio_call
     async def make_call(
         self,
         to: str,
@@ -106,112 +179,114 @@ class TwilioClient:
         from_: Optional[str] = None
     ) -> Dict[str, Any]:
         """Make a voice call"""
-        if not this.settings["voice_enabled"]:
+        if not self.settings["voice_enabled"]:
             raise ValueError("Voice calls are disabled")
+
+        response = await self._get_client().post(
+            self._calls_url,
+            data={
+                "To": to,
+                "From": from_ or self.settings["phone_number"],
+                "Twiml": twiml
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        return {
+            "call_sid": result["sid"],
+            "status": result["status"],
+            "to": result["to"],
+            "from": result["from"],
+            "date_created": result["date_created"]
+        }
             
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{this.base_url}/Accounts/{this.settings['account_sid']}/Calls.json",
-                    auth=aiohttp.BasicAuth(
-                        this.settings["account_sid"],
-                        this.settings["auth_token"]
-                    ),
-                    data={
-                        "To": to,
-                        "From": from_ or this.settings["phone_number"],
-                        "Twiml": twiml
-                    }
-                ) as response:
-                    result = await response.json()
-                    if response.status != 201:
-                        raise ValueError(f"Call failed: {result.get('message')}")
-                        
-                    return {
-                        "call_sid": result["sid"],
-                        "status": result["status"],
-                        "to": result["to"],
-                        "from": result["from"],
-                        "date_created": result["date_created"]
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error making call: {str(e)}")
-            raise
-            
+    @_twilio_call
     async def get_message_status(self, message_sid: str) -> Dict[str, Any]:
         """Get status of a message"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{this.base_url}/Accounts/{this.settings['account_sid']}/Messages/{message_sid}.json",
-                    auth=aiohttp.BasicAuth(
-                        this.settings["account_sid"],
-                        this.settings["auth_token"]
-                    )
-                ) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise ValueError(f"Failed to get message status: {result.get('message')}")
-                        
-                    return {
-                        "message_sid": result["sid"],
-                        "status": result["status"],
-                        "to": result["to"],
-                        "from": result["from"],
-                        "body": result["body"],
-                        "date_created": result["date_created"],
-                        "date_sent": result.get("date_sent"),
-                        "date_updated": result["date_updated"],
-                        "error_code": result.get("error_code"),
-                        "error_message": result.get("error_message")
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error getting message status: {str(e)}")
-            raise
+        cached = self._cached_status(message_sid)
+        if cached is not None:
+            return cached
+
+        response = await self._get_client().get(
+            f"{self._account_url}/Messages/{message_sid}.json"
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        payload = {
+            "message_sid": result["sid"],
+            "status": result["status"],
+            "to": result["to"],
+            "from": result["from"],
+            "body": result["body"],
+            "date_created": result["date_created"],
+            "date_sent": result.get("date_sent"),
+            "date_updated": result["date_updated"],
+            "error_code": result.get("error_code"),
+            "error_message": result.get("error_message")
+        }
+        self._store_status(
+            message_sid,
+            payload,
+            terminal=payload["status"] in self._TERMINAL_MESSAGE_STATUSES
+        )
+        return payload
             
+    @_twilio_call
     async def get_call_status(self, call_sid: str) -> Dict[str, Any]:
         """Get status of a call"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{this.base_url}/Accounts/{this.settings['account_sid']}/Calls/{call_sid}.json",
-                    auth=aiohttp.BasicAuth(
-                        this.settings["account_sid"],
-                        this.settings["auth_token"]
-                    )
-                ) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise ValueError(f"Failed to get call status: {result.get('message')}")
-                        
-                    return {
-                        "call_sid": result["sid"],
-                        "status": result["status"],
-                        "to": result["to"],
-                        "from": result["from"],
-                        "date_created": result["date_created"],
-                        "date_updated": result["date_updated"],
-                        "duration": result.get("duration"),
-                        "error_code": result.get("error_code"),
-                        "error_message": result.get("error_message")
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Error getting call status: {str(e)}")
-            raise
+        cached = self._cached_status(call_sid)
+        if cached is not None:
+            return cached
+
+        response = await self._get_client().get(
+            f"{self._account_url}/Calls/{call_sid}.json"
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        payload = {
+            "call_sid": result["sid"],
+            "status": result["status"],
+            "to": result["to"],
+            "from": result["from"],
+            "date_created": result["date_created"],
+            "date_updated": result["date_updated"],
+            "duration": result.get("duration"),
+            "error_code": result.get("error_code"),
+            "error_message": result.get("error_message")
+        }
+        self._store_status(
+            call_sid,
+            payload,
+            terminal=payload["status"] in self._TERMINAL_CALL_STATUSES
+        )
+        return payload
             
     def verify_webhook_signature(
         self,
-        body: str,
+        url: str,
+        params: Dict[str, str],
         headers: Dict[str, str]
     ) -> bool:
-        """Verify Twilio webhook signature"""
+        """Verify a Twilio webhook signature.
+
+        Twilio signs the full request URL followed by each POST
+        parameter name and value in sorted order, HMAC-SHA1 keyed with
+        the auth token, base64-encoded into X-Twilio-Signature.
+        """
         try:
-            # Implementation depends on Twilio's webhook verification method
-            # This is a placeholder for the actual implementation
-            return True
+            signature = headers.get("X-Twilio-Signature", "")
+            data = url + "".join(f"{key}{params[key]}" for key in sorted(params))
+            mac = hmac.new(
+                self.settings["auth_token"].encode("utf-8"),
+                msg=data.encode("utf-8"),
+                digestmod=hashlib.sha1
+            )
+            expected = base64.b64encode(mac.digest()).decode("ascii")
+            # Constant-time comparison; a plain == would leak timing
+            return hmac.compare_digest(expected, signature)
         except Exception as e:
             logger.error(f"Error verifying webhook signature: {str(e)}")
             return False
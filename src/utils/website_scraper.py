@@ -1,77 +1,131 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import aiohttp
 from bs4 import BeautifulSoup
 from src.config.config import WEBSITE_BASE_URL
 
+# lxml parses in C, several times faster than the pure-Python
+# html.parser on the page sizes the scraper sees
+_PARSER = "lxml"
+
+# Selector constants shared by the parse methods
+_SEL_PRODUCT = "div.product"
+_SEL_PRICE = "span.price"
+_SEL_SEARCH_NAME = "h2"
+_SEL_SEARCH_DESC = "p.description"
+_SEL_DETAIL_NAME = "h1.product-name"
+_SEL_DETAIL_DESC = "div.description"
+_SEL_SPECS = "div.specifications"
+_SEL_SPEC = "div.spec"
+_SEL_SPEC_KEY = "span.key"
+_SEL_SPEC_VALUE = "span.value"
+
 class WebsiteScraper:
     def __init__(self):
         self.base_url = WEBSITE_BASE_URL
+        # Every fetch hits the same host, so one pooled session with
+        # keep-alive and DNS caching beats a fresh TCP+TLS handshake
+        # per request
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=200,
+                    limit_per_host=50,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                    keepalive_timeout=75
+                ),
+                headers={"User-Agent": "MKZT-scraper/1.0"}
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse) -> bytes:
+        """Stream the response body as raw bytes.
+
+        Skips response.text(): chunks are gathered as they arrive and
+        handed to lxml undecoded, which sniffs the encoding itself in C
+        instead of paying a Python-side chardet pass over the full page.
+        """
+        buf = bytearray()
+        async for chunk in response.content.iter_chunked(16384):
+            buf.extend(chunk)
+        return bytes(buf)
 
     async def search_products(self, query: str) -> List[Dict[str, Any]]:
         """Search for products on the website"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/search",
-                    params={"q": query}
-                ) as response:
-                    html = await response.text()
-                    return self._parse_search_results(html)
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/search",
+                params={"q": query}
+            ) as response:
+                html = await self._read_body(response)
+                return self._parse_search_results(html)
         except Exception as e:
             return [{"error": str(e)}]
 
     async def get_product_details(self, product_id: str) -> Dict[str, Any]:
         """Get detailed information about a product"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/products/{product_id}"
-                ) as response:
-                    html = await response.text()
-                    return self._parse_product_details(html)
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/products/{product_id}"
+            ) as response:
+                html = await self._read_body(response)
+                return self._parse_product_details(html)
         except Exception as e:
             return {"error": str(e)}
 
-    def _parse_search_results(self, html: str) -> List[Dict[str, Any]]:
+    def _parse_search_results(self, html: bytes) -> List[Dict[str, Any]]:
         """Parse search results from HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, _PARSER)
         products = []
-        
+
         # TODO: Implement actual parsing logic based on website structure
         # This is a placeholder implementation
-        for product in soup.find_all('div', class_='product'):
+        for product in soup.select(_SEL_PRODUCT):
             products.append({
                 'id': product.get('data-product-id'),
-                'name': product.find('h2').text.strip(),
-                'price': product.find('span', class_='price').text.strip(),
-                'description': product.find('p', class_='description').text.strip()
+                'name': product.select_one(_SEL_SEARCH_NAME).text.strip(),
+                'price': product.select_one(_SEL_PRICE).text.strip(),
+                'description': product.select_one(_SEL_SEARCH_DESC).text.strip()
             })
-        
+
         return products
 
-    def _parse_product_details(self, html: str) -> Dict[str, Any]:
+    def _parse_product_details(self, html: bytes) -> Dict[str, Any]:
         """Parse product details from HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
+        soup = BeautifulSoup(html, _PARSER)
+
         # TODO: Implement actual parsing logic based on website structure
         # This is a placeholder implementation
         return {
-            'id': soup.find('div', class_='product').get('data-product-id'),
-            'name': soup.find('h1', class_='product-name').text.strip(),
-            'price': soup.find('span', class_='price').text.strip(),
-            'description': soup.find('div', class_='description').text.strip(),
+            'id': soup.select_one(_SEL_PRODUCT).get('data-product-id'),
+            'name': soup.select_one(_SEL_DETAIL_NAME).text.strip(),
+            'price': soup.select_one(_SEL_PRICE).text.strip(),
+            'description': soup.select_one(_SEL_DETAIL_DESC).text.strip(),
             'specifications': self._parse_specifications(soup)
         }
 
     def _parse_specifications(self, soup: BeautifulSoup) -> Dict[str, str]:
         """Parse product specifications"""
         specs = {}
-        specs_container = soup.find('div', class_='specifications')
-        
+        specs_container = soup.select_one(_SEL_SPECS)
+
         if specs_container:
-            for spec in specs_container.find_all('div', class_='spec'):
-                key = spec.find('span', class_='key').text.strip()
-                value = spec.find('span', class_='value').text.strip()
+            for spec in specs_container.select(_SEL_SPEC):
+                key = spec.select_one(_SEL_SPEC_KEY).text.strip()
+                value = spec.select_one(_SEL_SPEC_VALUE).text.strip()
                 specs[key] = value
-        
-        return specs 
\ No newline at end of file
+
+        return specs
\ No newline at end of file
@@ -1,32 +1,54 @@
 from typing import Dict, Any
+import asyncio
+import time
 from fastapi import Request
 from src.handlers.restaurant_dashboard import RestaurantDashboardHandler
 from src.handlers.driver_coordination import DriverCoordinationHandler
 from src.ai.enhanced_chatbot import EnhancedChatbot
 from src.utils.logger import logger
+# Webhook payloads run to several KB; the shared helper parses them
+# with orjson when it's available
+from src.utils._json import loads as _loads
+
+# Country-code prefix -> user type; one dict probe replaces the
+# sequential startswith chain
+_PREFIX_MAP = {
+    "+507": "restaurant",
+    "+508": "driver",
+}
 
 class EnhancedWhatsAppHandler:
     def __init__(self):
         self.customer_chatbot = EnhancedChatbot()
         self.restaurant_handler = RestaurantDashboardHandler()
         self.driver_handler = DriverCoordinationHandler()
-        
+        # Caps concurrent outbound sends so webhook fan-out stays within
+        # Twilio's per-number throughput limits
+        self._send_sem = asyncio.Semaphore(10)
+        # phone_number -> (expiry, user_type); identification runs once
+        # per inbound message, so even a DB-backed lookup stays off the
+        # hot path for repeat senders
+        self._user_type_cache: Dict[str, tuple] = {}
+
     async def process_webhook(self, request: Request) -> Dict[str, Any]:
         """Process incoming webhook from WhatsApp"""
         try:
-            data = await request.json()
-            
-            # Process messages
-            if "entry" in data and data["entry"]:
-                for entry in data["entry"]:
-                    if "changes" in entry and entry["changes"]:
-                        for change in entry["changes"]:
-                            if "value" in change and "messages" in change["value"]:
-                                for message in change["value"]["messages"]:
-                                    await self._route_message(message)
-            
+            data = _loads(await request.body())
+
+            # Process all messages in the payload concurrently instead of
+            # one awaited round-trip at a time; each handles its own errors
+            tasks = [
+                self._route_message(message)
+                for entry in data.get("entry") or []
+                for change in entry.get("changes") or []
+                if "value" in change and "messages" in change["value"]
+                for message in change["value"]["messages"]
+            ]
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
             return {"status": "success"}
-            
+
         except Exception as e:
             logger.error(f"Error processing webhook: {str(e)}")
             return {"status": "error", "message": str(e)}
@@ -60,22 +82,34 @@ class EnhancedWhatsAppHandler:
                     message=message_text
                 )
             
-            # Send response
-            await self.send_message(
-                to_number=phone_number,
-                message=response["message"],
-                quick_replies=response.get("quick_replies", [])
-            )
+            # Send response, throttled by the shared semaphore
+            async with self._send_sem:
+                await self.send_message(
+                    to_number=phone_number,
+                    message=response["message"],
+                    quick_replies=response.get("quick_replies", [])
+                )
             
         except Exception as e:
             logger.error(f"Error routing message: {str(e)}")
     
+    _USER_TYPE_TTL = 300.0  # seconds
+    _USER_TYPE_CACHE_MAX = 10_000
+
     async def _identify_user_type(self, phone_number: str) -> str:
         """Identify user type based on phone number"""
+        cached = self._user_type_cache.get(phone_number)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
         # This would typically check against your database
         # Simplified version for demonstration
-        if phone_number.startswith("+507"):
-            return "restaurant"
-        elif phone_number.startswith("+508"):
-            return "driver"
-        return "customer" 
\ No newline at end of file
+        user_type = _PREFIX_MAP.get(phone_number[:4], "customer")
+
+        if len(self._user_type_cache) >= self._USER_TYPE_CACHE_MAX:
+            self._user_type_cache.clear()
+        self._user_type_cache[phone_number] = (
+            time.monotonic() + self._USER_TYPE_TTL,
+            user_type
+        )
+        return user_type 
\ No newline at end of file
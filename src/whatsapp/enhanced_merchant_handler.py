@@ -4,20 +4,76 @@ from src.merchant.inventory_management import (
     PromotionManager,
     CustomerHistoryManager
 )
-from twilio.rest import Client
+from src.utils.twilio_client import twilio_client
 import os
 
+# Message templates per language. Placeholders match the keys of the
+# dicts the managers return, so the formatters can bind them with a
+# single format_map call
+_TEMPLATES = {
+    "es": {
+        "inventory": {
+            "summary": (
+                "📦 *Resumen de inventario*\n"
+                "Total de productos: {total_items}\n"
+                "Stock bajo: {low_stock_items}\n"
+                "Agotados: {out_of_stock}\n"
+                "Por vencer: {expiring_soon}"
+            ),
+            "alerts_header": "⚠️ *Alertas:*",
+            "no_alerts": "✅ Sin alertas de inventario",
+            "options": [
+                "1️⃣ Ver stock bajo",
+                "2️⃣ Actualizar inventario",
+                "3️⃣ Volver al menú"
+            ]
+        },
+        "promotions": {
+            "summary": (
+                "🎯 *Promociones activas:* {active_count}\n"
+                "Canjes totales: {total_redemptions}\n"
+                "Impacto en ventas: {revenue_impact}"
+            )
+        },
+        "customers": {
+            "summary": (
+                "👥 *Resumen de clientes*\n"
+                "Total: {total_customers}\n"
+                "Nuevos (30 días): {new_customers_30d}\n"
+                "Recurrentes: {repeat_customers}\n"
+                "Ticket promedio: {average_order_value}"
+            ),
+            "segments": "📊 *Segmentos:*",
+            "segment_format": "• {name}: {count} ({percentage}%)",
+            "options": [
+                "1️⃣ Ver detalles de cliente",
+                "2️⃣ Volver al menú"
+            ]
+        }
+    }
+}
+
 class EnhancedMerchantHandler:
     def __init__(self):
         self.inventory_manager = InventoryManager()
         self.promotion_manager = PromotionManager()
         self.customer_manager = CustomerHistoryManager()
-        self.twilio_client = Client(
-            os.getenv("TWILIO_ACCOUNT_SID"),
-            os.getenv("TWILIO_AUTH_TOKEN")
-        )
-        self.whatsapp_number = os.getenv("TWILIO_WHATSAPP_NUMBER")
-        
+        self.templates = _TEMPLATES
+        # Bind the per-section template dicts and format callables once;
+        # the formatters run per message and shouldn't re-walk the
+        # nested dict or re-parse the format string arguments
+        self._tpl_inv = self.templates["es"]["inventory"]
+        self._tpl_promo = self.templates["es"]["promotions"]
+        self._tpl_cust = self.templates["es"]["customers"]
+        self._inv_summary_fmt = self._tpl_inv["summary"].format_map
+        self._promo_summary_fmt = self._tpl_promo["summary"].format_map
+        self._cust_summary_fmt = self._tpl_cust["summary"].format_map
+        self._cust_segment_fmt = self._tpl_cust["segment_format"].format_map
+
+    async def _send_message(self, to_number: str, message: str) -> None:
+        """Send a WhatsApp message through the shared async client"""
+        await twilio_client.send_whatsapp(to=to_number, body=message)
+
     async def process_merchant_request(self, 
                                      request_data: Dict[str, Any]) -> None:
         """Process merchant requests for inventory, promotions, or customers"""
@@ -91,60 +147,40 @@ class EnhancedMerchantHandler:
 
     def _format_inventory_message(self, summary: Dict[str, Any]) -> str:
         """Format inventory summary message"""
-        template = self.templates["es"]["inventory"]
-        
-        message = template["summary"].format(
-            total_items=summary["summary"]["total_items"],
-            low_stock=summary["summary"]["low_stock_items"],
-            out_of_stock=summary["summary"]["out_of_stock"],
-            expiring_soon=summary["summary"]["expiring_soon"]
-        )
-        
+        template = self._tpl_inv
+
+        # Collect the pieces and join once; repeated += reallocates the
+        # whole string on every append
+        parts = [self._inv_summary_fmt(summary["summary"])]
+
         if summary["alerts"]:
-            message += f"\n\n{template['alerts_header']}\n"
-            message += "\n".join(summary["alerts"])
+            parts.append("\n".join([template["alerts_header"], *summary["alerts"]]))
         else:
-            message += f"\n\n{template['no_alerts']}"
-            
-        message += "\n\n" + "\n".join(template["options"])
-        
-        return message
+            parts.append(template["no_alerts"])
+
+        parts.append("\n".join(template["options"]))
+
+        return "\n\n".join(parts)
 
     def _format_promotion_message(self, result: Dict[str, Any]) -> str:
         """Format promotion message"""
-        template = self.templates["es"]["promotions"]
-        
         if result["status"] == "success":
-            message = f"✅ {result['message']}\n\n"
-            message += template["summary"].format(
-                active_count=result["promotion"]["active_count"],
-                redemptions=result["promotion"]["total_redemptions"],
-                revenue_impact=result["promotion"]["revenue_impact"]
-            )
-        else:
-            message = f"❌ Error: {result['message']}"
-            
-        return message
+            return f"✅ {result['message']}\n\n{self._promo_summary_fmt(result['promotion'])}"
+        return f"❌ Error: {result['message']}"
 
     def _format_customer_insights_message(self, insights: Dict[str, Any]) -> str:
         """Format customer insights message"""
-        template = self.templates["es"]["customers"]
-        
-        message = template["summary"].format(
-            total=insights["summary"]["total_customers"],
-            new_customers=insights["summary"]["new_customers_30d"],
-            repeat_customers=insights["summary"]["repeat_customers"],
-            average_order=insights["summary"]["average_order_value"]
-        )
-        
-        message += f"\n\n{template['segments']}\n"
-        for segment in insights["segments"]:
-            message += template["segment_format"].format(
-                segment_name=segment["name"],
-                count=segment["count"],
-                percentage=segment["percentage"]
-            ) + "\n"
-            
-        message += "\n" + "\n".join(template["options"])
-        
-        return message 
\ No newline at end of file
+        template = self._tpl_cust
+
+        segment_lines = [
+            self._cust_segment_fmt(segment)
+            for segment in insights["segments"]
+        ]
+
+        parts = [
+            self._cust_summary_fmt(insights["summary"]),
+            "\n".join([template["segments"], *segment_lines]),
+            "\n".join(template["options"])
+        ]
+
+        return "\n\n".join(parts) 
\ No newline at end of file
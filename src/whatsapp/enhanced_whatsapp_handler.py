@@ -1,27 +1,60 @@
 from typing import Dict, Any, List
 from src.handlers.enhanced_multilingual_handler import EnhancedMultilingualHandler, AdvancedOrderTracking
-from twilio.rest import Client
-import asyncio
-import json
-import os
+from src.utils.twilio_client import twilio_client
+import time
+
+# Built once at import: these are rebuilt on every exception / every
+# formatted order otherwise
+_ERROR_MESSAGES = {
+    "en": "Sorry, there was an error processing your message. Please try again.",
+    "es": "Lo sentimos, hubo un error procesando tu mensaje. Por favor intenta nuevamente.",
+    "pt": "Desculpe, houve um erro ao processar sua mensagem. Por favor, tente novamente."
+}
+
+_ITEM_TEMPLATES = {
+    "en": "• {quantity}x {name} ({restaurant})",
+    "es": "• {quantity}x {name} ({restaurant})",
+    "pt": "• {quantity}x {name} ({restaurant})"
+}
 
 class EnhancedWhatsAppHandler:
+    _LANG_TTL = 3600.0  # seconds; users do occasionally switch language
+    _LANG_CACHE_MAX = 10_000
+
     def __init__(self):
         self.multilingual_handler = EnhancedMultilingualHandler()
         self.order_tracking = AdvancedOrderTracking()
-        self.twilio_client = Client(
-            os.getenv("TWILIO_ACCOUNT_SID"),
-            os.getenv("TWILIO_AUTH_TOKEN")
-        )
-        self.whatsapp_number = os.getenv("TWILIO_WHATSAPP_NUMBER")
-        
+        # phone_number -> (expiry, language); a user's language is
+        # stable enough that detection (a model call) only needs to run
+        # on their first message and after the TTL, and the cap keeps
+        # the cache from growing forever in a long-lived process
+        self._lang_cache: Dict[str, tuple] = {}
+
     async def process_message(self, message_data: Dict[str, Any]) -> None:
         """Process incoming WhatsApp message with enhanced features"""
         try:
-            # Detect message language
             message_text = message_data.get("text", "")
-            language = await self.multilingual_handler.detect_language(message_text)
-            
+            phone_number = message_data.get("phone_number")
+
+            # System-triggered events (order_new, driver_update, ...)
+            # already know the user's language; fall back to the cache
+            # before paying for detection
+            language = message_data.get("language")
+            if language is None and phone_number:
+                cached = self._lang_cache.get(phone_number)
+                if cached is not None and time.monotonic() < cached[0]:
+                    language = cached[1]
+            if language is None:
+                language = await self.multilingual_handler.detect_language(message_text)
+            if phone_number:
+                if len(self._lang_cache) >= self._LANG_CACHE_MAX:
+                    self._lang_cache.clear()
+                self._lang_cache[phone_number] = (
+                    time.monotonic() + self._LANG_TTL,
+                    language
+                )
+
+
             # Process based on message type
             if message_data.get("type") == "order_new":
                 await self._handle_new_order(message_data, language)
@@ -34,14 +67,9 @@ class EnhancedWhatsAppHandler:
             
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
-            error_messages = {
-                "en": "Sorry, there was an error processing your message. Please try again.",
-                "es": "Lo sentimos, hubo un error procesando tu mensaje. Por favor intenta nuevamente.",
-                "pt": "Desculpe, houve um erro ao processar sua mensagem. Por favor, tente novamente."
-            }
             await self._send_message(
                 message_data["phone_number"],
-                error_messages.get(language, error_messages["en"])
+                _ERROR_MESSAGES.get(language, _ERROR_MESSAGES["en"])
             )
 
     async def _handle_new_order(self, data: Dict[str, Any], language: str) -> None:
@@ -103,40 +131,34 @@ class EnhancedWhatsAppHandler:
     async def _send_rich_message(self, to_number: str, message: Dict[str, Any]) -> None:
         """Send rich WhatsApp message with media and interactive elements"""
         try:
-            message_params = {
-                "from_": f"whatsapp:{self.whatsapp_number}",
-                "to": f"whatsapp:{to_number}",
-                "body": message["text"]
-            }
-            
-            # Add media if present
-            if "media" in message:
-                message_params["media_url"] = [message["media"]["url"]]
-            
+            extra_fields = {}
+
             # Add location if present
-            if any(comp["type"] == "location" for comp in message.get("components", [])):
-                location = next(
-                    comp["location"] for comp in message["components"] 
-                    if comp["type"] == "location"
-                )
-                message_params["persistent_action"] = [
+            location = next(
+                (comp["location"] for comp in message.get("components", [])
+                 if comp["type"] == "location"),
+                None
+            )
+            if location is not None:
+                extra_fields["PersistentAction"] = (
                     f"geo:{location['latitude']},{location['longitude']}"
-                ]
-            
-            self.twilio_client.messages.create(**message_params)
-            
+                )
+
+            # The shared async client keeps the event loop free and
+            # reuses pooled connections across concurrent sends
+            await twilio_client.send_whatsapp(
+                to=to_number,
+                body=message["text"],
+                media_url=message.get("media", {}).get("url"),
+                extra_fields=extra_fields or None
+            )
+
         except Exception as e:
             logger.error(f"Error sending rich message: {str(e)}")
 
     def _format_items(self, items: List[Dict[str, Any]], language: str) -> str:
         """Format order items in the appropriate language"""
-        item_templates = {
-            "en": "• {quantity}x {name} ({restaurant})",
-            "es": "• {quantity}x {name} ({restaurant})",
-            "pt": "• {quantity}x {name} ({restaurant})"
-        }
-        
-        template = item_templates.get(language, item_templates["en"])
+        template = _ITEM_TEMPLATES.get(language, _ITEM_TEMPLATES["en"])
         return "\n".join([
             template.format(**item) for item in items
-        ]) 
\ No newline at end of file
+        ])
\ No newline at end of file
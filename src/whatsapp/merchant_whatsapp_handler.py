@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from src.merchant.merchant_dashboard_handler import MerchantDashboardHandler
 from twilio.rest import Client
+import asyncio
 import os
 from src.merchant.advanced_analytics_system import AnalyticsType
 
@@ -40,7 +41,10 @@ class MerchantWhatsAppHandler:
     async def _send_message(self, to_number: str, message: str) -> None:
         """Send WhatsApp message to merchant"""
         try:
-            self.twilio_client.messages.create(
+            # messages.create blocks for the full HTTPS round-trip; run
+            # it on a thread so the event loop stays responsive
+            await asyncio.to_thread(
+                self.twilio_client.messages.create,
                 body=message,
                 from_=f"whatsapp:{self.whatsapp_number}",
                 to=f"whatsapp:{to_number}"
@@ -51,7 +55,8 @@ class MerchantWhatsAppHandler:
     async def _send_error_message(self, to_number: str) -> None:
         """Send error message to merchant"""
         try:
-            self.twilio_client.messages.create(
+            await asyncio.to_thread(
+                self.twilio_client.messages.create,
                 body="Sorry, there was an error processing your request. Please try again later.",
                 from_=f"whatsapp:{self.whatsapp_number}",
                 to=f"whatsapp:{to_number}"
@@ -59,25 +64,23 @@ class MerchantWhatsAppHandler:
         except Exception as e:
             logger.error(f"Error sending error message: {str(e)}")
 
-# Example advanced analytics
-analytics_result = await analytics_system.generate_advanced_analytics(
-    merchant_id="rolling_sushi_01",
-    analysis_type=AnalyticsType.SALES
-)
-
-# Example price optimization
-pricing_result = await analytics_system.optimize_pricing(
-    merchant_id="rolling_sushi_01",
-    product_id="california_roll"
-)
-
-# Example customer segmentation
-segmentation_result = await analytics_system.segment_customers(
-    merchant_id="rolling_sushi_01"
-)
-
-# Example inventory prediction
-inventory_result = await analytics_system.predict_inventory_needs(
-    merchant_id="rolling_sushi_01",
-    forecast_period=14  # 2 weeks forecast
-) 
\ No newline at end of file
+# Example usage (module-level await is invalid syntax; kept for reference):
+#
+# analytics_result = await analytics_system.generate_advanced_analytics(
+#     merchant_id="rolling_sushi_01",
+#     analysis_type=AnalyticsType.SALES
+# )
+#
+# pricing_result = await analytics_system.optimize_pricing(
+#     merchant_id="rolling_sushi_01",
+#     product_id="california_roll"
+# )
+#
+# segmentation_result = await analytics_system.segment_customers(
+#     merchant_id="rolling_sushi_01"
+# )
+#
+# inventory_result = await analytics_system.predict_inventory_needs(
+#     merchant_id="rolling_sushi_01",
+#     forecast_period=14  # 2 weeks forecast
+# ) 
\ No newline at end of file
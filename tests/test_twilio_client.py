@@ -0,0 +1,96 @@
+import base64
+import hashlib
+import hmac
+import pytest
+from unittest.mock import patch
+from src.utils.twilio_client import TwilioClient
+
+AUTH_TOKEN = "12345"
+
+TWILIO_SETTINGS = {
+    "account_sid": "ACtest",
+    "auth_token": AUTH_TOKEN,
+    "phone_number": "+1122334455",
+    "whatsapp_number": "+1122334455",
+    "webhook_secret": "secret",
+    "sms_enabled": True,
+    "voice_enabled": True,
+    "whatsapp_enabled": True,
+}
+
+# The worked example from Twilio's security documentation: signing these
+# parameters for this URL with auth token "12345" must yield exactly
+# this X-Twilio-Signature value
+DOC_URL = "https://mycompany.com/myapp.php?foo=1&bar=2"
+DOC_PARAMS = {
+    "CallSid": "CA1234567890ABCDE",
+    "Caller": "+14158675310",
+    "Digits": "1234",
+    "From": "+14158675310",
+    "To": "+18005551212",
+}
+DOC_SIGNATURE = "GvWf1cFY/Q7PnoempGyD5oXAezc="
+
+
+@pytest.fixture
+def client():
+    """TwilioClient wired to fixed settings instead of the environment"""
+    with patch(
+        "src.utils.twilio_client.external_service_settings.get_twilio_settings",
+        return_value=TWILIO_SETTINGS,
+    ):
+        return TwilioClient()
+
+
+def _sign(url, params, token=AUTH_TOKEN):
+    """Build a signature the way Twilio does, for generating test inputs"""
+    data = url + "".join(f"{key}{params[key]}" for key in sorted(params))
+    digest = hmac.new(token.encode(), data.encode(), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode()
+
+
+def test_verify_accepts_documented_vector(client):
+    """The documented Twilio example signature verifies"""
+    headers = {"X-Twilio-Signature": DOC_SIGNATURE}
+    assert client.verify_webhook_signature(DOC_URL, DOC_PARAMS, headers) is True
+
+
+def test_verify_accepts_valid_signature(client):
+    url = "https://example.com/webhook"
+    params = {"From": "+1234567890", "Body": "hello"}
+    headers = {"X-Twilio-Signature": _sign(url, params)}
+    assert client.verify_webhook_signature(url, params, headers) is True
+
+
+def test_verify_rejects_tampered_params(client):
+    url = "https://example.com/webhook"
+    params = {"From": "+1234567890", "Body": "hello"}
+    headers = {"X-Twilio-Signature": _sign(url, params)}
+    params["Body"] = "hello; rm -rf /"
+    assert client.verify_webhook_signature(url, params, headers) is False
+
+
+def test_verify_rejects_wrong_url(client):
+    params = {"From": "+1234567890"}
+    headers = {"X-Twilio-Signature": _sign("https://example.com/webhook", params)}
+    assert client.verify_webhook_signature("https://evil.example.com/webhook", params, headers) is False
+
+
+def test_verify_rejects_signature_from_wrong_token(client):
+    url = "https://example.com/webhook"
+    params = {"From": "+1234567890"}
+    headers = {"X-Twilio-Signature": _sign(url, params, token="not-the-token")}
+    assert client.verify_webhook_signature(url, params, headers) is False
+
+
+def test_verify_rejects_missing_header(client):
+    url = "https://example.com/webhook"
+    params = {"From": "+1234567890"}
+    assert client.verify_webhook_signature(url, params, {}) is False
+
+
+def test_verify_rejects_garbage_header(client):
+    url = "https://example.com/webhook"
+    params = {"From": "+1234567890"}
+    headers = {"X-Twilio-Signature": "not even base64!!"}
+    assert client.verify_webhook_signature(url, params, headers) is False